@@ -0,0 +1,92 @@
+"""
+Compare the read-only pages served over WSGI and over ASGI.
+
+Starts gunicorn with sync workers on `blogicum.wsgi`, then with uvicorn
+workers on `blogicum.asgi` and `blogicum.urls_asgi` (async views), and
+fires the same concurrent requests at each page:
+
+    DB_NAME=blogicum DB_USER=blogicum DB_PASSWORD=... \
+        python benchmarks/asgi_vs_wsgi.py --workers 4 --requests 2000
+
+Needs `uvicorn` installed next to gunicorn and a migrated, populated
+database; any `DB_*` and `CACHE_*` variables are passed to the servers.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from db_connections import PROJECT_DIR, fetch, wait_until_up
+
+SERVERS = {
+    'wsgi': ['blogicum.wsgi', '--worker-class', 'sync'],
+    'asgi': [
+        'blogicum.asgi', '--worker-class', 'uvicorn.workers.UvicornWorker'
+    ],
+}
+URLCONFS = {
+    'wsgi': 'blogicum.urls',
+    'asgi': 'blogicum.urls_asgi',
+}
+
+
+def run_server(name, args):
+    env = {
+        **os.environ,
+        'DJANGO_SETTINGS_MODULE': 'blogicum.settings_production',
+        'DJANGO_SECRET_KEY': os.getenv('DJANGO_SECRET_KEY', 'benchmark'),
+        'DJANGO_ALLOWED_HOSTS': '127.0.0.1',
+        'DJANGO_ROOT_URLCONF': URLCONFS[name],
+    }
+    server = subprocess.Popen(
+        [
+            sys.executable, '-m', 'gunicorn', *SERVERS[name],
+            '--workers', str(args.workers),
+            '--bind', f'127.0.0.1:{args.port}', '--log-level', 'warning',
+        ],
+        cwd=PROJECT_DIR, env=env,
+    )
+    try:
+        for path in args.path:
+            url = f'http://127.0.0.1:{args.port}{path}'
+            wait_until_up(url)
+            started = time.perf_counter()
+            with ThreadPoolExecutor(args.concurrency) as executor:
+                latencies = sorted(
+                    executor.map(fetch, [url] * args.requests)
+                )
+            elapsed = time.perf_counter() - started
+            print(
+                f'{name:<5} {path:<32} {args.requests / elapsed:>9.1f} req/s'
+                f'  p50 {statistics.median(latencies) * 1000:>7.2f} ms'
+                f'  p95 {latencies[int(len(latencies) * 0.95)] * 1000:>7.2f}'
+                ' ms'
+            )
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--port', type=int, default=8766)
+    parser.add_argument(
+        '--path', action='append',
+        help='Page to request, repeatable; the first two feed pages and'
+             ' the about page by default.'
+    )
+    parser.add_argument('--server', choices=SERVERS, action='append')
+    args = parser.parse_args()
+    args.path = args.path or ['/', '/?page=2', '/pages/about/']
+    for name in args.server or SERVERS:
+        run_server(name, args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+"""
+Measure what persistent and pooled connections save under gunicorn.
+
+Starts gunicorn with several workers on `blogicum.settings_production`
+once per connection mode and fires concurrent requests at one page:
+
+    DB_NAME=blogicum DB_USER=blogicum DB_PASSWORD=... \
+        python benchmarks/db_connections.py --workers 4 --requests 2000
+
+The database has to be migrated beforehand. `per-request` is the Django
+default of opening a connection for every request, `persistent` keeps it
+for `CONN_MAX_AGE` seconds, `pooled` hands it out from the in-process pool.
+The connections column is the growth of `pg_stat_database.sessions`
+(PostgreSQL 14+), i.e. how many times the server accepted a connection.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.request import urlopen
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent / 'blogicum'
+
+MODES = {
+    'per-request': {'DB_CONN_MAX_AGE': '0', 'DB_POOL_MAX_SIZE': ''},
+    'persistent': {'DB_CONN_MAX_AGE': '600', 'DB_POOL_MAX_SIZE': ''},
+    'pooled': {'DB_CONN_MAX_AGE': '0', 'DB_POOL_MAX_SIZE': '8'},
+}
+
+
+def server_sessions(env):
+    """Count the connections the database server has accepted so far."""
+    import psycopg2
+
+    with psycopg2.connect(
+        dbname=env['DB_NAME'], user=env['DB_USER'],
+        password=env.get('DB_PASSWORD', ''),
+        host=env.get('DB_HOST', 'localhost'), port=env.get('DB_PORT', '5432'),
+    ) as connection, connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT sessions FROM pg_stat_database WHERE datname = %s',
+            [env['DB_NAME']],
+        )
+        return cursor.fetchone()[0]
+
+
+def wait_until_up(url, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            urlopen(url).read()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f'{url} did not come up in {timeout} seconds')
+
+
+def fetch(url):
+    started = time.perf_counter()
+    urlopen(url).read()
+    return time.perf_counter() - started
+
+
+def run_mode(name, overrides, args):
+    env = {
+        **os.environ,
+        'DJANGO_SETTINGS_MODULE': 'blogicum.settings_production',
+        'DJANGO_SECRET_KEY': os.getenv('DJANGO_SECRET_KEY', 'benchmark'),
+        'DJANGO_ALLOWED_HOSTS': '127.0.0.1',
+        'DB_ENGINE': 'postgresql',
+        **overrides,
+    }
+    server = subprocess.Popen(
+        [
+            sys.executable, '-m', 'gunicorn', 'blogicum.wsgi',
+            '--workers', str(args.workers), '--threads', str(args.threads),
+            '--bind', f'127.0.0.1:{args.port}', '--log-level', 'warning',
+        ],
+        cwd=PROJECT_DIR, env=env,
+    )
+    url = f'http://127.0.0.1:{args.port}{args.path}'
+    try:
+        wait_until_up(url)
+        sessions_before = server_sessions(env)
+        started = time.perf_counter()
+        with ThreadPoolExecutor(args.concurrency) as executor:
+            latencies = list(executor.map(fetch, [url] * args.requests))
+        elapsed = time.perf_counter() - started
+        sessions = server_sessions(env) - sessions_before
+    finally:
+        server.terminate()
+        server.wait()
+    latencies.sort()
+    print(
+        f'{name:<12} {args.requests / elapsed:>9.1f} req/s'
+        f'  p50 {statistics.median(latencies) * 1000:>7.2f} ms'
+        f'  p95 {latencies[int(len(latencies) * 0.95)] * 1000:>7.2f} ms'
+        f'  connections {sessions:>6}'
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--threads', type=int, default=2)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--path', default='/')
+    parser.add_argument('--mode', choices=MODES, action='append')
+    args = parser.parse_args()
+    for name in args.mode or MODES:
+        run_mode(name, MODES[name], args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+"""
+Measure rendering `blog/index.html` with ten post cards per loader setup.
+
+    python benchmarks/template_render.py --renders 500
+
+`filesystem` is the development setup that finds and compiles every
+template and include on each render, `cached` the production one warmed
+up by `blogicum.warmup`. Card fragments are not cached, so every render
+goes through `post_card.html` and its includes.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent / 'blogicum'
+sys.path.insert(0, str(PROJECT_DIR))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'blogicum.settings_production')
+os.environ.setdefault('DJANGO_SECRET_KEY', 'benchmark')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.contrib.auth.models import AnonymousUser  # noqa: E402
+from django.core.paginator import Paginator  # noqa: E402
+from django.template import RequestContext  # noqa: E402
+from django.template.backends.django import DjangoTemplates  # noqa: E402
+from django.test import RequestFactory  # noqa: E402
+from django.utils import timezone  # noqa: E402
+
+from blog.models import Category, Post, User, make_excerpt  # noqa: E402
+
+SOURCE_LOADERS = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+LOADERS = {
+    'filesystem': SOURCE_LOADERS,
+    'cached': [('django.template.loaders.cached.Loader', SOURCE_LOADERS)],
+}
+
+
+def make_engine(loaders):
+    template_settings = settings.TEMPLATES[0]
+    return DjangoTemplates({
+        'NAME': 'benchmark',
+        'DIRS': template_settings['DIRS'],
+        'APP_DIRS': False,
+        'OPTIONS': {
+            **template_settings['OPTIONS'],
+            'loaders': loaders,
+            'debug': False,
+        },
+    }).engine
+
+
+def make_context():
+    author = User(id=1, username='author')
+    category = Category(
+        id=1, title='Категория', slug='category', is_published=True
+    )
+    posts = []
+    for number in range(1, 11):
+        post = Post(
+            id=number, title=f'Публикация {number}',
+            excerpt=make_excerpt('Текст публикации ' * 50),
+            pub_date=timezone.now(), is_published=True, comment_count=3,
+            author=author, category=category,
+        )
+        post.card_version = str(number)
+        posts.append(post)
+    request = RequestFactory().get('/')
+    request.user = AnonymousUser()
+    page = Paginator(posts, 10).page(1)
+    return request, {
+        'page_obj': page,
+        'paginator': page.paginator,
+        'is_paginated': False,
+        # A zero timeout disables the card fragment cache.
+        'card_cache_timeout': 0,
+    }
+
+
+def measure(engine, request, context, renders):
+    timings = []
+    for _ in range(renders):
+        started = time.perf_counter()
+        engine.get_template('blog/index.html').render(
+            RequestContext(request, context)
+        )
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--renders', type=int, default=300)
+    args = parser.parse_args()
+    request, context = make_context()
+    for name, loaders in LOADERS.items():
+        engine = make_engine(loaders)
+        if name == 'cached':
+            measure(engine, request, context, 1)
+        timings = measure(engine, request, context, args.renders)
+        print(
+            f'{name:<10} mean {statistics.mean(timings) * 1000:>7.3f} ms'
+            f'  median {statistics.median(timings) * 1000:>7.3f} ms'
+        )
+
+
+if __name__ == '__main__':
+    main()
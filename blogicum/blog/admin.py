@@ -3,14 +3,52 @@
 This module configures the administrative interface of the 'blog' app.
 """
 
-from django.contrib import admin
+from django.contrib import admin, messages
+from django.contrib.admin.views.main import PAGE_VAR
 
+from .forms import PostActionForm
 from .models import Category, Location, Post, Comment
+from .moderation import (
+    delete_posts, move_posts, publish_posts, unpublish_posts
+)
+from .search import search_posts
+from .utils import ApproximateCountPaginator, count_cache_key
 from .validators import ForbiddenWord
 
 admin.site.empty_value_display = 'Не задано'
 
 
+class LargeTableAdminMixin:
+    """
+    Mixin for changelists of tables too large to count on every page.
+
+    The paginator estimates the number of matching rows, and the total
+    number of rows is not counted at all.
+    """
+
+    show_full_result_count = False
+
+    def get_paginator(self, request, queryset, per_page, orphans=0,
+                      allow_empty_first_page=True):
+        """Get a paginator that estimates the count of the filtered rows."""
+        query = request.GET.copy()
+        query.pop(PAGE_VAR, None)
+        return ApproximateCountPaginator(
+            queryset, per_page,
+            count_cache_key(f'{request.path}?{query.urlencode()}'),
+            orphans=orphans, allow_empty_first_page=allow_empty_first_page
+        )
+
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        """Load the choices of editable list columns once per changelist."""
+        formfield = super().formfield_for_foreignkey(
+            db_field, request, **kwargs
+        )
+        if db_field.name in self.list_editable and formfield is not None:
+            formfield.choices = list(formfield.choices)
+        return formfield
+
+
 class CategoryAdmin(admin.ModelAdmin):
     """This class customizes the admin interface for the `Category` model."""
 
@@ -24,9 +62,10 @@ class CategoryAdmin(admin.ModelAdmin):
         'is_published',
         'slug'
     )
+    search_fields = ('title',)
 
 
-class PostAdmin(admin.ModelAdmin):
+class PostAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     """This class customizes the admin interface for the `Post` model."""
 
     list_display = (
@@ -41,9 +80,69 @@ class PostAdmin(admin.ModelAdmin):
         'is_published',
         'category'
     )
+    list_select_related = ('author', 'location', 'category')
     search_fields = ('title',)
-    list_filter = ('category', 'location')
+    list_filter = ('is_published', 'category')
     list_display_links = ('title',)
+    date_hierarchy = 'pub_date'
+    raw_id_fields = ('author',)
+    autocomplete_fields = ('location',)
+    action_form = PostActionForm
+    actions = (
+        'publish', 'unpublish', 'move_to_category', 'delete_by_author'
+    )
+
+    @admin.action(description='Опубликовать выбранные публикации',
+                  permissions=('change',))
+    def publish(self, request, queryset):
+        """Publish the selected posts batch-wise."""
+        self.message_user(
+            request, f'Опубликовано публикаций: {publish_posts(queryset)}'
+        )
+
+    @admin.action(description='Снять с публикации выбранные публикации',
+                  permissions=('change',))
+    def unpublish(self, request, queryset):
+        """Hide the selected posts batch-wise."""
+        self.message_user(
+            request, f'Скрыто публикаций: {unpublish_posts(queryset)}'
+        )
+
+    @admin.action(description='Перенести выбранные публикации в категорию',
+                  permissions=('change',))
+    def move_to_category(self, request, queryset):
+        """Move the selected posts to the category chosen in the form."""
+        category = Category.objects.filter(
+            pk=request.POST.get('category') or None
+        ).first()
+        if category is None:
+            self.message_user(
+                request, 'Выберите категорию для переноса.', messages.ERROR
+            )
+            return
+        moved = move_posts(queryset, category)
+        self.message_user(
+            request, f'Перенесено в «{category}» публикаций: {moved}'
+        )
+
+    @admin.action(description='Удалить все публикации авторов выбранных',
+                  permissions=('delete',))
+    def delete_by_author(self, request, queryset):
+        """Delete every post of the authors of the selected posts."""
+        if not request.POST.get('confirm'):
+            self.message_user(
+                request, 'Отметьте «Подтверждаю удаление».', messages.ERROR
+            )
+            return
+        authors = set(queryset.values_list('author', flat=True))
+        deleted = delete_posts(Post.objects.filter(author__in=authors))
+        self.message_user(request, f'Удалено публикаций: {deleted}')
+
+    def get_search_results(self, request, queryset, search_term):
+        """Search posts through the full-text index."""
+        if not search_term:
+            return queryset, False
+        return search_posts(queryset, search_term), False
 
 
 class LocationAdmin(admin.ModelAdmin):
@@ -60,8 +159,29 @@ class LocationAdmin(admin.ModelAdmin):
     list_display_links = ('name',)
 
 
+class CommentAdmin(LargeTableAdminMixin, admin.ModelAdmin):
+    """This class customizes the admin interface for the `Comment` model."""
+
+    list_display = (
+        '__str__',
+        'post',
+        'author',
+        'created_at'
+    )
+    raw_id_fields = ('post', 'author')
+
+    def get_queryset(self, request):
+        """Join the post titles and author names the list shows."""
+        return super().get_queryset(request).select_related(
+            'post', 'author'
+        ).only(
+            'text', 'created_at', 'post', 'author',
+            'post__title', 'author__username'
+        )
+
+
 admin.site.register(Category, CategoryAdmin)
 admin.site.register(Location, LocationAdmin)
 admin.site.register(Post, PostAdmin)
-admin.site.register(Comment)
+admin.site.register(Comment, CommentAdmin)
 admin.site.register(ForbiddenWord)
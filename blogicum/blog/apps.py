@@ -13,3 +13,7 @@ class BlogConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'blog'
     verbose_name = 'Блог'
+
+    def ready(self):
+        """Connect signal handlers."""
+        from blog import signals  # noqa F401
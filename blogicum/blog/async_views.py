@@ -0,0 +1,204 @@
+"""
+Async versions of the read-only blog views for the ASGI entry point.
+
+Django 3.2 has no async ORM, so queries still run on threads, but each one
+gets a thread and a connection of its own: a page starts the queries that
+do not depend on each other together and renders once all of them are
+back. Validation, caching and templates are shared with the sync views.
+"""
+import asyncio
+from calendar import timegm
+
+from django.core.cache import cache, caches
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+from blog import views
+from blog.caching import (
+    attach_card_versions, card_cache_timeout, page_cache_key
+)
+from blog.constants import Config
+from blog.forms import CommentsForm
+from blog.models import Category, Post, User
+from blog.utils import (
+    elided_page_range, get_feed_cache_key, get_feed_cache_timeout, pack_page,
+    unpack_page
+)
+from blogicum.db.concurrency import AsyncViewMixin, run_query
+
+
+class AsyncPageMixin(AsyncViewMixin):
+    """Mixin for serving a read-only page from an async handler."""
+
+    async def get(self, request, *args, **kwargs):
+        """Answer 304 when possible, otherwise serve or render the page."""
+        etag, last_modified = await run_query(
+            self.get_conditional_validators
+        )
+        etag = quote_etag(etag)
+        last_modified = last_modified and timegm(last_modified.utctimetuple())
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            response = await self.get_page_response(request)
+        if last_modified and not response.has_header('Last-Modified'):
+            response['Last-Modified'] = http_date(last_modified)
+        if not response.has_header('ETag'):
+            response['ETag'] = etag
+        return response
+
+    async def get_page_response(self, request):
+        """Serve anonymous visitors from the page cache, render otherwise."""
+        anonymous = not request.user.is_authenticated
+        page_cache = caches[Config.PAGE_CACHE_ALIAS]
+        key = page_cache_key(request.path, self.etag)
+        if anonymous:
+            response = await run_query(page_cache.get, key)
+            if response is not None:
+                return response
+        response = self.render_to_response(await self.get_page_context())
+        await run_query(response.render)
+        if anonymous and self.is_cacheable(request, response):
+            await run_query(
+                page_cache.set, key, response, Config.PAGE_CACHE_TIMEOUT
+            )
+        return response
+
+    async def get_page_context(self):
+        """Fetch everything the template renders."""
+        raise NotImplementedError
+
+    async def paginate_concurrently(self, queryset, page_size):
+        """Get `(paginator, page)`, counting and fetching rows together."""
+        cursor = self.request.GET.get(self.cursor_kwarg)
+        if self.keyset_pagination or cursor:
+            return None, await run_query(
+                self.get_keyset_page, queryset, cursor, page_size
+            )
+        paginator = self.get_paginator(
+            queryset, page_size, orphans=self.get_paginate_orphans(),
+            allow_empty_first_page=self.get_allow_empty()
+        )
+        number = await run_query(self.get_page_number, paginator)
+        offset = (number - 1) * page_size
+        _, object_list = await asyncio.gather(
+            run_query(lambda: paginator.count),
+            run_query(lambda: list(queryset[offset:offset + page_size]))
+        )
+        return paginator, self.get_numbered_page(
+            paginator, number, object_list
+        )
+
+    async def get_feed_context(self, paginator, page, **kwargs):
+        """Build the context of a page of post cards."""
+        versions = await run_query(attach_card_versions, page)
+        self.object_list = page.object_list
+        return {
+            'view': self,
+            'paginator': paginator,
+            'page_obj': page,
+            'is_paginated': page.has_other_pages(),
+            'page_query': self.get_page_query(),
+            'page_range': paginator and elided_page_range(
+                paginator, page.number
+            ),
+            'object_list': page.object_list,
+            'card_cache_timeout': card_cache_timeout(versions),
+            **kwargs,
+        }
+
+
+class SitemapView(views.SitemapView):
+    """
+    View for sitemaps, rendered whole before it is sent.
+
+    The ASGI handler of Django 3.2 iterates streamed content on the event
+    loop, where queries are not allowed, so a chunk is built in the view
+    thread instead; its size is still bounded by the chunk size.
+    """
+
+    streaming = False
+
+
+class PostListView(AsyncPageMixin, views.PostListView):
+    """Async view for listing posts."""
+
+    async def get_page_context(self):
+        """Get the feed page from the feed cache or the database."""
+        queryset = self.get_queryset()
+        key = await run_query(
+            get_feed_cache_key, self.request.GET.urlencode(), self.now
+        )
+        packed = await run_query(cache.get, key)
+        if packed is None:
+            packed = pack_page(
+                *await self.paginate_concurrently(queryset, self.paginate_by)
+            )
+            await run_query(lambda: cache.set(
+                key, packed, get_feed_cache_timeout(self.now)
+            ))
+        paginator, page = unpack_page(packed, queryset, self.paginate_by)
+        return await self.get_feed_context(
+            paginator, page, post_list=page.object_list
+        )
+
+
+class PostDetailView(AsyncPageMixin, views.PostDetailView):
+    """Async view for showing post-details."""
+
+    async def get_page_context(self):
+        """Fetch the post and its comments at the same time."""
+        self.object, comments = await asyncio.gather(
+            run_query(self.get_object), run_query(self.get_comments_page)
+        )
+        return {
+            'view': self,
+            'object': self.object,
+            'post': self.object,
+            'form': CommentsForm(),
+            'comments': comments,
+        }
+
+
+class PostCommentsView(PostDetailView):
+    """Async view for rendering the next batch of post comments."""
+
+    template_name = 'includes/comment_list.html'
+
+
+class CategoryDetailView(AsyncPageMixin, views.CategoryDetailView):
+    """Async view for showing category details."""
+
+    async def get_page_context(self):
+        """Fetch the category, its posts and their count at the same time."""
+        posts = Post.objects.published().for_category(
+            Category.objects.filter(
+                slug=self.kwargs[self.slug_url_kwarg], is_published=True
+            ).values('pk')[:1]
+        ).card_columns()
+        self.object, (paginator, page) = await asyncio.gather(
+            run_query(self.get_object),
+            self.paginate_concurrently(posts, self.paginate_by)
+        )
+        return await self.get_feed_context(
+            paginator, page, object=self.object, category=self.object
+        )
+
+
+class UserProfileDetailView(AsyncPageMixin, views.UserProfileDetailView):
+    """Async view for showing user profile details."""
+
+    async def get_page_context(self):
+        """Fetch the author, their posts and the count at the same time."""
+        posts = Post.objects.by_author(User.objects.filter(
+            username=self.kwargs[self.slug_url_kwarg]
+        ).values('pk')[:1]).card_columns()
+        self.object, (paginator, page) = await asyncio.gather(
+            run_query(self.get_object),
+            self.paginate_concurrently(posts, self.paginate_by)
+        )
+        return await self.get_feed_context(
+            paginator, page, object=self.object, user=self.request.user,
+            profile=self.object
+        )
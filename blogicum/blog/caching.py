@@ -0,0 +1,91 @@
+"""
+Cache version stamps of the blog app.
+
+Cached fragments embed the versions of the rows they were rendered from,
+so bumping a version from a signal handler invalidates every fragment that
+depends on it without having to know the fragment keys.
+"""
+import hashlib
+import time
+from datetime import datetime, timezone
+
+from django.core.cache import cache
+
+from blog.constants import Config
+from blogicum.db.routers import read_from_primary_after
+
+
+def version_key(namespace, pk=None) -> str:
+    """Get the cache key of a version stamp."""
+    if pk is None:
+        return f'blog:version:{namespace}'
+    return f'blog:version:{namespace}:{pk}'
+
+
+def get_versions(keys) -> dict:
+    """Get version stamps by keys, starting a new version for missing ones."""
+    versions = cache.get_many(keys)
+    missing = {key: time.time_ns() for key in keys if key not in versions}
+    if missing:
+        cache.set_many(missing, timeout=None)
+        versions.update(missing)
+    return versions
+
+
+def bump_versions(keys) -> None:
+    """Start new versions for the given keys."""
+    now = time.time_ns()
+    cache.set_many({key: now for key in keys}, timeout=None)
+
+
+def post_card_version_keys(post) -> list:
+    """Get the version keys a rendered post card depends on."""
+    return [
+        version_key('post', post.pk),
+        version_key('user', post.author_id),
+        version_key('category', post.category_id),
+        version_key('location', post.location_id),
+    ]
+
+
+def attach_card_versions(posts) -> dict:
+    """Set `card_version` on posts with a single cache round trip."""
+    keys_by_post = [(post, post_card_version_keys(post)) for post in posts]
+    versions = get_versions(
+        list({key for _, keys in keys_by_post for key in keys})
+    )
+    for post, keys in keys_by_post:
+        post.card_version = '.'.join(str(versions[key]) for key in keys)
+    return versions
+
+
+def read_fresh_from_primary(stamps) -> bool:
+    """
+    Read from the primary if a version stamp is too fresh for the replicas.
+
+    Return whether the rows already read came from a replica that may lag.
+    """
+    stamps = list(stamps)
+    return bool(stamps) and read_from_primary_after(max(stamps) / 1e9)
+
+
+def card_cache_timeout(versions) -> int:
+    """Get how long to cache post cards, not caching lagging replica reads."""
+    if read_fresh_from_primary(versions.values()):
+        return 0
+    return Config.POST_CARD_CACHE_TIMEOUT
+
+
+def make_etag(*parts) -> str:
+    """Digest the values a response was rendered from into an ETag."""
+    return hashlib.md5(repr(parts).encode()).hexdigest()
+
+
+def page_cache_key(path, etag) -> str:
+    """Get the cache key of a whole page."""
+    return f'blog:page:{hashlib.md5(path.encode()).hexdigest()}:{etag}'
+
+
+def version_datetime(version) -> datetime:
+    """Get the moment a version stamp was started."""
+    return datetime.fromtimestamp(version / 1e9, tz=timezone.utc)
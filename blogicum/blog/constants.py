@@ -7,5 +7,42 @@ class Config:
     TRUNCATION_LENGTH = 30
     ORDER_BY_DATE_DESC = '-pub_date'
     POST_PER_PAGE = 10
-    CLOSE_MATCH_NUM = 1
     CUTOFF_POSSIBLE_SCORE: float = 0.6  # range[0,1]
+    FORBIDDEN_MATCH_CACHE_SIZE = 10000
+    KEYSET_PAGINATION = False
+    PAGE_RANGE_ON_EACH_SIDE = 2
+    PAGE_RANGE_ON_ENDS = 1
+    APPROXIMATE_COUNT = False
+    APPROXIMATE_COUNT_THRESHOLD = 10000
+    COUNT_CACHE_TIMEOUT = 300
+    CURSOR_QUERY_PARAM = 'cursor'
+    FEED_KEYSET_ORDERING = (ORDER_BY_DATE_DESC, '-id')
+    COMMENTS_PER_PAGE = 20
+    COMMENT_KEYSET_ORDERING = ('created_at', 'id')
+    POST_CARD_CACHE_TIMEOUT = 60 * 60 * 24
+    FEED_CACHE_BUCKET = 60  # seconds
+    IMAGE_WIDTHS = (320, 640, 960)
+    IMAGE_QUALITY = 80
+    PAGE_CACHE_ALIAS = 'pages'
+    PAGE_CACHE_TIMEOUT = 600
+    POST_DETAIL_COLUMNS = (
+        'title', 'text', 'pub_date', 'image', 'image_width', 'is_published',
+        'author__username',
+        'category__title', 'category__slug', 'category__is_published',
+        'location__name', 'location__is_published',
+    )
+    POST_CARD_COLUMNS = (
+        'title', 'excerpt', 'pub_date', 'image', 'image_width',
+        'is_published', 'comment_count', 'author__username',
+        'category__title', 'category__slug', 'category__is_published',
+        'location__name', 'location__is_published',
+    )
+    EXCERPT_WORDS = 10
+    SYNDICATION_ITEMS = 20
+    SITEMAP_CHUNK_SIZE = 50000  # primary keys per sitemap file
+    SITEMAP_BATCH_SIZE = 2000
+    MODERATION_BATCH_SIZE = 1000
+    SEARCH_QUERY_PARAM = 'q'
+    SEARCH_MAX_TERMS = 10
+    SEARCH_CONFIG = 'russian'  # PostgreSQL text search configuration
+    SEARCH_REINDEX_BATCH_SIZE = 1000
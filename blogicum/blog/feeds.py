@@ -0,0 +1,196 @@
+"""
+RSS and Atom feeds of published posts.
+
+Aggregators poll feeds far more often than anything changes, so the ETag
+and Last-Modified of a feed are cached under the feed version until the
+next scheduled post goes live: a poll with nothing new gets 304 Not
+Modified without touching the database, and a changed feed is rendered
+once into the page cache.
+"""
+import hashlib
+from calendar import timegm
+
+from django.contrib.syndication.views import Feed
+from django.core.cache import cache, caches
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.feedgenerator import Atom1Feed
+from django.utils.http import http_date, quote_etag
+
+from blog.caching import (
+    get_versions, make_etag, page_cache_key, read_fresh_from_primary,
+    version_datetime, version_key
+)
+from blog.constants import Config
+from blog.models import Category, Post, User
+from blog.utils import get_feed_cache_timeout
+
+
+class CachedFeedMixin:
+    """Mixin for answering feed polls from the cache."""
+
+    def get_conditional_validators(self, request, *args, **kwargs):
+        """Get the ETag and the Last-Modified timestamp of the feed."""
+        feed_key = version_key('feed')
+        version = get_versions([feed_key])[feed_key]
+        read_fresh_from_primary([version])
+        url = request.build_absolute_uri()
+        key = (f'blog:syndication:{version}:'
+               f'{hashlib.md5(url.encode()).hexdigest()}')
+        validators = cache.get(key)
+        if validators is None:
+            now = timezone.now()
+            published_at = self.get_posts(
+                self.get_object(request, *args, **kwargs), now
+            ).values_list('pub_date', flat=True).first()
+            last_modified = max(
+                [version_datetime(version)]
+                + [published_at] * bool(published_at)
+            )
+            validators = (
+                quote_etag(make_etag(url, version, published_at)),
+                timegm(last_modified.utctimetuple())
+            )
+            cache.set(key, validators, get_feed_cache_timeout(now))
+        return validators
+
+    def __call__(self, request, *args, **kwargs):
+        """Answer 304 when possible, otherwise serve or render the feed."""
+        etag, last_modified = self.get_conditional_validators(
+            request, *args, **kwargs
+        )
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            page_cache = caches[Config.PAGE_CACHE_ALIAS]
+            key = page_cache_key(request.build_absolute_uri(), etag)
+            response = page_cache.get(key)
+            if response is None:
+                response = super().__call__(request, *args, **kwargs)
+                page_cache.set(key, response, Config.PAGE_CACHE_TIMEOUT)
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        return response
+
+
+class AtomFeedMixin:
+    """Mixin for serving a feed in the Atom format."""
+
+    feed_type = Atom1Feed
+
+    def subtitle(self, obj):
+        """Get the feed subtitle."""
+        return self.description(obj)
+
+
+class PostsFeed(CachedFeedMixin, Feed):
+    """RSS feed of the latest published posts."""
+
+    def title(self, obj):
+        """Get the feed title."""
+        return 'Блогикум'
+
+    def description(self, obj):
+        """Get the feed description."""
+        return 'Новые публикации Блогикума.'
+
+    def link(self, obj):
+        """Get the page the feed follows."""
+        return reverse('blog:index')
+
+    def get_posts(self, obj, now=None):
+        """Get the published posts of the feed."""
+        return Post.objects.published(now)
+
+    def items(self, obj):
+        """Get the latest posts of the feed."""
+        return self.get_posts(obj).card_columns()[:Config.SYNDICATION_ITEMS]
+
+    def item_title(self, item):
+        """Get the title of a post."""
+        return item.title
+
+    def item_description(self, item):
+        """Get the excerpt of a post."""
+        return item.excerpt
+
+    def item_link(self, item):
+        """Get the page of a post."""
+        return reverse('blog:post_detail', args=(item.pk,))
+
+    def item_pubdate(self, item):
+        """Get the publication date of a post."""
+        return item.pub_date
+
+    def item_author_name(self, item):
+        """Get the author of a post."""
+        return item.author.username
+
+    def item_categories(self, item):
+        """Get the category of a post."""
+        return (item.category.title,) if item.category else ()
+
+
+class CategoryPostsFeed(PostsFeed):
+    """RSS feed of the latest published posts of a category."""
+
+    def get_object(self, request, category_slug):
+        """Get the published category."""
+        return get_object_or_404(
+            Category, slug=category_slug, is_published=True
+        )
+
+    def title(self, obj):
+        """Get the feed title."""
+        return f'Блогикум: {obj.title}'
+
+    def description(self, obj):
+        """Get the feed description."""
+        return f'Новые публикации в категории «{obj.title}».'
+
+    def link(self, obj):
+        """Get the page the feed follows."""
+        return reverse('blog:category_posts', args=(obj.slug,))
+
+    def get_posts(self, obj, now=None):
+        """Get the published posts of the category."""
+        return super().get_posts(obj, now).for_category(obj)
+
+
+class AuthorPostsFeed(PostsFeed):
+    """RSS feed of the latest published posts of an author."""
+
+    def get_object(self, request, username):
+        """Get the author."""
+        return get_object_or_404(User, username=username)
+
+    def title(self, obj):
+        """Get the feed title."""
+        return f'Блогикум: {obj.username}'
+
+    def description(self, obj):
+        """Get the feed description."""
+        return f'Новые публикации пользователя {obj.username}.'
+
+    def link(self, obj):
+        """Get the page the feed follows."""
+        return reverse('blog:profile', args=(obj.username,))
+
+    def get_posts(self, obj, now=None):
+        """Get the published posts of the author."""
+        return super().get_posts(obj, now).by_author(obj)
+
+
+class AtomPostsFeed(AtomFeedMixin, PostsFeed):
+    """Atom feed of the latest published posts."""
+
+
+class AtomCategoryPostsFeed(AtomFeedMixin, CategoryPostsFeed):
+    """Atom feed of the latest published posts of a category."""
+
+
+class AtomAuthorPostsFeed(AtomFeedMixin, AuthorPostsFeed):
+    """Atom feed of the latest published posts of an author."""
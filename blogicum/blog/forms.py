@@ -1,7 +1,8 @@
 """Form classes."""
 from django import forms
+from django.contrib.admin.helpers import ActionForm
 
-from blog.models import Post, Comment
+from blog.models import Category, Post, Comment
 
 
 class PostForm(forms.ModelForm):
@@ -30,3 +31,14 @@ class CommentsForm(forms.ModelForm):
 
         model = Comment
         fields = ('text',)
+
+
+class PostActionForm(ActionForm):
+    """The admin action form with the arguments of post moderation."""
+
+    category = forms.ModelChoiceField(
+        Category.objects.all(), required=False, label='Категория'
+    )
+    confirm = forms.BooleanField(
+        required=False, label='Подтверждаю удаление'
+    )
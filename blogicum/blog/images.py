@@ -0,0 +1,90 @@
+"""
+Responsive derivatives of post images.
+
+Every uploaded image gets a copy per width of `Config.IMAGE_WIDTHS` it is
+at least as wide as, saved next to the original under predictable names.
+The width of the original is stored with the post, so templates can build
+a `srcset` of the copies that exist without touching the storage.
+"""
+import posixpath
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps, features
+
+from blog.constants import Config
+
+THUMBNAIL_FORMAT, THUMBNAIL_EXTENSION = (
+    ('WEBP', 'webp') if features.check('webp') else ('JPEG', 'jpg')
+)
+# What Pillow raises for a file it cannot read or should not decode.
+IMAGE_ERRORS = (OSError, ValueError, Image.DecompressionBombError)
+EXIF_ORIENTATION = 0x0112
+# EXIF orientations that turn the image a quarter round.
+TRANSPOSED_ORIENTATIONS = (5, 6, 7, 8)
+
+
+def thumbnail_name(name, width) -> str:
+    """Get the storage name of the `width` pixels wide copy of an image."""
+    directory, filename = posixpath.split(name)
+    root = posixpath.splitext(filename)[0]
+    return posixpath.join(
+        directory, 'thumbs', f'{root}_{width}w.{THUMBNAIL_EXTENSION}'
+    )
+
+
+def thumbnail_widths(width) -> list:
+    """Get the widths of the copies of an image `width` pixels wide."""
+    return [size for size in Config.IMAGE_WIDTHS if size <= (width or 0)]
+
+
+def image_srcset(image, width) -> str:
+    """Build the `srcset` of an image field file `width` pixels wide."""
+    widths = thumbnail_widths(width)
+    candidates = [
+        (image.storage.url(thumbnail_name(image.name, size)), size)
+        for size in widths
+    ]
+    if width and width not in widths and width < max(Config.IMAGE_WIDTHS):
+        candidates.append((image.url, width))
+    return ', '.join(f'{url} {size}w' for url, size in candidates)
+
+
+def has_thumbnails(image, width) -> bool:
+    """Check an image has been measured and its largest copy exists."""
+    if width is None:
+        return False
+    widths = thumbnail_widths(width)
+    return not widths or image.storage.exists(
+        thumbnail_name(image.name, max(widths))
+    )
+
+
+def generate_thumbnails(image) -> int:
+    """Save downscaled copies of an image field file, return its width."""
+    storage = image.storage
+    with storage.open(image.name) as original:
+        source = Image.open(original)
+        width, height = source.size
+        orientation = source.getexif().get(EXIF_ORIENTATION)
+        if orientation in TRANSPOSED_ORIENTATIONS:
+            width = height
+        source.draft('RGB', (max(Config.IMAGE_WIDTHS),) * 2)
+        source = ImageOps.exif_transpose(source)
+        has_alpha = (source.mode in ('RGBA', 'LA')
+                     or 'transparency' in source.info)
+        if THUMBNAIL_FORMAT == 'WEBP' and has_alpha:
+            source = source.convert('RGBA')
+        else:
+            source = source.convert('RGB')
+        for size in sorted(thumbnail_widths(width), reverse=True):
+            copy = source.copy()
+            copy.thumbnail((size, size * 10), Image.Resampling.LANCZOS)
+            buffer = BytesIO()
+            copy.save(buffer, THUMBNAIL_FORMAT,
+                      quality=Config.IMAGE_QUALITY, optimize=True)
+            name = thumbnail_name(image.name, size)
+            if storage.exists(name):
+                storage.delete(name)
+            storage.save(name, ContentFile(buffer.getvalue()))
+    return width
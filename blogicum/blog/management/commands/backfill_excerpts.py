@@ -0,0 +1,55 @@
+"""Store `Post.excerpt` for posts saved before it existed."""
+from django.core.management.base import BaseCommand
+
+from blog.caching import bump_versions, version_key
+from blog.models import Post, make_excerpt
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+class Command(BaseCommand):
+    """Backfill stored excerpts of posts."""
+
+    help = 'Заполняет отрывки текста публикаций.'
+
+    def add_arguments(self, parser):
+        """Add command arguments."""
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help='Количество публикаций, обрабатываемых за один запрос.'
+        )
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Пересчитать отрывки всех публикаций, а не только пустые.'
+        )
+
+    def handle(self, *args, **options):
+        """Walk posts by primary key and store excerpts batch-wise."""
+        batch_size = options['batch_size']
+        posts = Post.objects.order_by('pk').only('text', 'excerpt')
+        if not options['all']:
+            posts = posts.filter(excerpt='')
+        last_pk, updated = 0, 0
+        while True:
+            batch = list(posts.filter(pk__gt=last_pk)[:batch_size])
+            if not batch:
+                break
+            last_pk = batch[-1].pk
+            changed = []
+            for post in batch:
+                excerpt = make_excerpt(post.text)
+                if excerpt != post.excerpt:
+                    post.excerpt = excerpt
+                    changed.append(post)
+            Post.objects.bulk_update(changed, ['excerpt'])
+            bump_versions(
+                [version_key('post', post.pk) for post in changed]
+                + [version_key('feed')] * bool(changed)
+            )
+            updated += len(changed)
+        self.stdout.write(
+            self.style.SUCCESS(f'Обновлено отрывков: {updated}')
+        )
@@ -0,0 +1,55 @@
+"""Write gzipped sitemap files for the web server to serve."""
+import gzip
+import os
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from blog.sitemaps import (
+    SECTIONS, iter_sitemap_index, iter_urlset, sitemap_path
+)
+
+
+class Command(BaseCommand):
+    """Refresh the pre-generated sitemap files."""
+
+    help = 'Создаёт сжатые файлы карты сайта.'
+
+    def add_arguments(self, parser):
+        """Add command arguments."""
+        parser.add_argument(
+            'base_url',
+            help='Адрес сайта, например https://blog.example.com.'
+        )
+        parser.add_argument(
+            '--output-dir',
+            default=settings.SITEMAP_ROOT,
+            help='Директория для файлов карты сайта.'
+        )
+
+    def handle(self, *args, **options):
+        """Write every chunk, then the index that lists them."""
+        base_url = options['base_url'].rstrip('/')
+        output_dir = Path(options['output_dir'])
+        output_dir.mkdir(parents=True, exist_ok=True)
+        written = 0
+        for section in SECTIONS.values():
+            for number in section.chunk_numbers():
+                self.write(
+                    output_dir / f'{sitemap_path(section, number)[1:]}.gz',
+                    iter_urlset(section, number, base_url)
+                )
+                written += 1
+        self.write(output_dir / 'sitemap.xml.gz',
+                   iter_sitemap_index(base_url, suffix='.gz'))
+        self.stdout.write(
+            self.style.SUCCESS(f'Записано файлов карты сайта: {written + 1}')
+        )
+
+    def write(self, path, content):
+        """Write a file next to its old version, then swap them."""
+        partial = path.with_name(f'{path.name}.partial')
+        with gzip.open(partial, 'wt', encoding='utf-8') as file:
+            file.writelines(content)
+        os.replace(partial, path)
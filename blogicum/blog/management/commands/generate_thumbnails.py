@@ -0,0 +1,42 @@
+"""Create the responsive copies of post images uploaded before they existed."""
+from django.core.management.base import BaseCommand
+
+from blog.caching import bump_versions, version_key
+from blog.images import IMAGE_ERRORS, generate_thumbnails, has_thumbnails
+from blog.models import Post
+
+
+class Command(BaseCommand):
+    """Backfill downscaled copies of post images."""
+
+    help = 'Создаёт уменьшенные копии изображений публикаций.'
+
+    def add_arguments(self, parser):
+        """Add command arguments."""
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Пересоздать копии, даже если они уже есть.'
+        )
+
+    def handle(self, *args, **options):
+        """Walk posts with images, measure and downscale the missing ones."""
+        posts = Post.objects.exclude(image='').only('image', 'image_width')
+        created = 0
+        for post in posts.iterator():
+            if options['force'] or not has_thumbnails(
+                    post.image, post.image_width):
+                try:
+                    width = generate_thumbnails(post.image)
+                except IMAGE_ERRORS as error:
+                    self.stderr.write(f'{post.image.name}: {error}')
+                    continue
+                if width != post.image_width:
+                    Post.objects.filter(pk=post.pk).update(image_width=width)
+                    bump_versions([
+                        version_key('post', post.pk), version_key('feed')
+                    ])
+                created += 1
+        self.stdout.write(
+            self.style.SUCCESS(f'Обработано изображений: {created}')
+        )
@@ -0,0 +1,91 @@
+"""Publish, hide, move or delete posts in bulk."""
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.constants import Config
+from blog.models import Category, Post
+from blog.moderation import (
+    delete_posts, move_posts, publish_posts, unpublish_posts
+)
+
+
+class Command(BaseCommand):
+    """Moderate posts selected by author, category or id."""
+
+    help = 'Массово публикует, скрывает, переносит или удаляет публикации.'
+
+    def add_arguments(self, parser):
+        """Add command arguments."""
+        parser.add_argument(
+            'action',
+            choices=('publish', 'unpublish', 'move', 'delete'),
+            help='Что сделать с выбранными публикациями.'
+        )
+        parser.add_argument(
+            '--author',
+            action='append',
+            default=[],
+            help='Имя пользователя автора публикаций; можно повторять.'
+        )
+        parser.add_argument(
+            '--category',
+            action='append',
+            default=[],
+            help='Идентификатор категории публикаций; можно повторять.'
+        )
+        parser.add_argument(
+            '--ids',
+            nargs='+',
+            type=int,
+            default=[],
+            help='Номера публикаций.'
+        )
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Выбрать все публикации.'
+        )
+        parser.add_argument(
+            '--to-category',
+            help='Идентификатор категории, в которую переносятся публикации.'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=Config.MODERATION_BATCH_SIZE,
+            help='Количество публикаций, изменяемых за один запрос.'
+        )
+
+    def handle(self, *args, **options):
+        """Select the posts and apply the action batch-wise."""
+        posts = Post.objects.all()
+        if options['author']:
+            posts = posts.filter(author__username__in=options['author'])
+        if options['category']:
+            posts = posts.filter(category__slug__in=options['category'])
+        if options['ids']:
+            posts = posts.filter(pk__in=options['ids'])
+        if not (options['author'] or options['category'] or options['ids']
+                or options['all']):
+            raise CommandError(
+                'Укажите --author, --category, --ids или --all.'
+            )
+        batch_size = options['batch_size']
+        action = options['action']
+        if action == 'publish':
+            changed = publish_posts(posts, batch_size)
+        elif action == 'unpublish':
+            changed = unpublish_posts(posts, batch_size)
+        elif action == 'move':
+            category = Category.objects.filter(
+                slug=options['to_category']
+            ).first()
+            if category is None:
+                raise CommandError(
+                    'Укажите существующую категорию в --to-category.'
+                )
+            changed = move_posts(posts, category, batch_size)
+        else:
+            changed = delete_posts(posts, batch_size)
+        self.stdout.write(
+            self.style.SUCCESS(f'Обработано публикаций: {changed}')
+        )
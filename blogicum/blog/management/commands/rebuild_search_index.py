@@ -0,0 +1,44 @@
+"""Rebuild the full-text search index of posts."""
+from django.core.management.base import BaseCommand
+from django.db import router, transaction
+
+from blog.constants import Config
+from blog.models import Post
+from blog.search import get_search_backend
+
+
+class Command(BaseCommand):
+    """Index every post from scratch."""
+
+    help = 'Перестраивает поисковый индекс публикаций.'
+
+    def add_arguments(self, parser):
+        """Add command arguments."""
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=Config.SEARCH_REINDEX_BATCH_SIZE,
+            help='Количество публикаций, индексируемых за один запрос.'
+        )
+
+    def handle(self, *args, **options):
+        """Recreate the index, then fill it batch by batch of primary keys."""
+        using = router.db_for_write(Post)
+        backend = get_search_backend(using)
+        with transaction.atomic(using=using):
+            backend.drop_index()
+            backend.create_index()
+        posts = Post.objects.using(using).order_by('pk')
+        last_pk, indexed = 0, 0
+        while True:
+            pks = list(posts.filter(pk__gt=last_pk).values_list(
+                'pk', flat=True
+            )[:options['batch_size']])
+            if not pks:
+                break
+            last_pk = pks[-1]
+            backend.index(Post.objects.using(using).filter(pk__in=pks))
+            indexed += len(pks)
+        self.stdout.write(
+            self.style.SUCCESS(f'Проиндексировано публикаций: {indexed}')
+        )
@@ -0,0 +1,61 @@
+"""Recount `Post.comment_count` for posts whose counter has drifted."""
+from django.core.management.base import BaseCommand
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from blog.models import Comment, Post
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+class Command(BaseCommand):
+    """Reconcile stored comment counters with the comments table."""
+
+    help = 'Пересчитывает счётчики комментариев у публикаций.'
+
+    def add_arguments(self, parser):
+        """Add command arguments."""
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help='Количество публикаций, проверяемых за один запрос.'
+        )
+
+    def handle(self, *args, **options):
+        """Walk posts by primary key and fix drifted counters batch-wise."""
+        batch_size = options['batch_size']
+        last_pk, fixed = 0, 0
+        while True:
+            batch = list(
+                Post.objects.filter(pk__gt=last_pk).order_by('pk').values_list(
+                    'pk', flat=True
+                )[:batch_size]
+            )
+            if not batch:
+                break
+            last_pk = batch[-1]
+            drifted = [
+                pk for pk, stored, actual in Post.objects.filter(
+                    pk__in=batch
+                ).order_by().annotate(
+                    actual=Count('comments')
+                ).values_list('pk', 'comment_count', 'actual')
+                if stored != actual
+            ]
+            Post.objects.filter(pk__in=drifted).update(
+                comment_count=Coalesce(
+                    Subquery(
+                        Comment.objects.filter(
+                            post=OuterRef('pk')
+                        ).order_by().values('post').annotate(
+                            total=Count('pk')
+                        ).values('total')
+                    ),
+                    0
+                )
+            )
+            fixed += len(drifted)
+        self.stdout.write(
+            self.style.SUCCESS(f'Исправлено счётчиков: {fixed}')
+        )
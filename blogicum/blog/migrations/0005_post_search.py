@@ -0,0 +1,54 @@
+from django.db import migrations
+
+# The index as of this migration, kept apart from the live `blog.search`.
+SOURCE_SQL = (
+    "SELECT p.id, p.title, p.text, COALESCE(c.title, ''),"
+    " COALESCE(l.name, '')"
+    " FROM blog_post p"
+    " LEFT JOIN blog_category c ON c.id = p.category_id"
+    " LEFT JOIN blog_location l ON l.id = p.location_id"
+)
+
+CREATE_INDEX_SQL = {
+    'sqlite': [
+        "CREATE VIRTUAL TABLE IF NOT EXISTS blog_post_search USING fts5("
+        "title, text, category, location,"
+        " tokenize='unicode61 remove_diacritics 2')",
+        "INSERT INTO blog_post_search"
+        " (rowid, title, text, category, location) " + SOURCE_SQL,
+    ],
+    'postgresql': [
+        "CREATE TABLE IF NOT EXISTS blog_post_search ("
+        "post_id bigint PRIMARY KEY REFERENCES blog_post (id)"
+        " ON DELETE CASCADE DEFERRABLE INITIALLY DEFERRED,"
+        " document tsvector NOT NULL)",
+        "CREATE INDEX IF NOT EXISTS blog_post_search_document_idx"
+        " ON blog_post_search USING GIN (document)",
+        "INSERT INTO blog_post_search (post_id, document)"
+        " SELECT id, to_tsvector('russian'::regconfig, concat_ws(' ',"
+        " title, text, category, location))"
+        f" FROM ({SOURCE_SQL})"
+        " AS source (id, title, text, category, location)",
+    ],
+}
+
+
+def create_search_index(apps, schema_editor):
+    for sql in CREATE_INDEX_SQL.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(sql)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor in CREATE_INDEX_SQL:
+        schema_editor.execute('DROP TABLE IF EXISTS blog_post_search')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0004_post_excerpt'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
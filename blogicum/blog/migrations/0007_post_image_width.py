@@ -0,0 +1,18 @@
+# Generated by Django 3.2.16 on 2026-10-17 07:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0006_post_pub_date_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='image_width',
+            field=models.IntegerField(editable=False, null=True, verbose_name='Ширина изображения'),
+        ),
+    ]
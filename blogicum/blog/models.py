@@ -11,9 +11,13 @@ and author.
 
 from django.contrib.auth import get_user_model
 from django.db import models
+from django.db.models import Q
 from django.template.defaultfilters import truncatechars
+from django.utils import timezone
+from django.utils.text import Truncator
 
 from blog.constants import Config
+from .images import image_srcset
 from .validators import forbidden_words
 
 User = get_user_model()
@@ -33,11 +37,61 @@ class CreationPublishedModel(models.Model):
         abstract = True
 
 
+def published_q(now=None) -> Q:
+    """Match posts published, due by `now` and in a published category."""
+    return Q(
+        is_published=True,
+        category__is_published=True,
+        pub_date__lte=now or timezone.now()
+    )
+
+
+def make_excerpt(text) -> str:
+    """Cut the beginning of a post text shown on its card."""
+    return Truncator(text).words(Config.EXCERPT_WORDS, truncate=' …')
+
+
+class PostQuerySet(models.QuerySet):
+    """Chainable post filters and column sets."""
+
+    def published(self, now=None):
+        """Keep posts visible to everyone by `now`."""
+        return self.filter(published_q(now))
+
+    def visible_to(self, user, now=None):
+        """Keep posts published by `now` and every post of `user`."""
+        visible = published_q(now)
+        if user.is_authenticated:
+            visible |= Q(author=user)
+        return self.filter(visible)
+
+    def for_category(self, category):
+        """Keep posts of a category."""
+        return self.filter(category=category)
+
+    def by_author(self, author):
+        """Keep posts of an author."""
+        return self.filter(author=author)
+
+    def with_card_data(self):
+        """Join the rows a post card renders."""
+        return self.select_related('author', 'category', 'location')
+
+    def card_columns(self):
+        """Load only what a post card renders, leaving out the text."""
+        return self.with_card_data().only(*Config.POST_CARD_COLUMNS)
+
+    def detail_columns(self):
+        """Load only what the post page renders."""
+        return self.with_card_data().only(*Config.POST_DETAIL_COLUMNS)
+
+
 class Post(CreationPublishedModel):
     """Post model represents a single post in the blog."""
 
     title = models.CharField('Заголовок', max_length=256)
     text = models.TextField('Текст', validators=(forbidden_words,))
+    excerpt = models.TextField('Отрывок', blank=True, editable=False)
     pub_date = models.DateTimeField(
         verbose_name='Дата и время публикации',
         help_text='Если установить дату и время в будущем — можно'
@@ -46,7 +100,8 @@ class Post(CreationPublishedModel):
     author = models.ForeignKey(
         User,
         verbose_name='Автор публикации',
-        on_delete=models.CASCADE
+        on_delete=models.CASCADE,
+        db_index=False
     )
     location = models.ForeignKey(
         'Location',
@@ -67,6 +122,18 @@ class Post(CreationPublishedModel):
         upload_to='post_images',
         blank=True
     )
+    image_width = models.IntegerField(
+        'Ширина изображения',
+        null=True,
+        editable=False
+    )
+    comment_count = models.PositiveIntegerField(
+        'Количество комментариев',
+        default=0,
+        editable=False
+    )
+
+    objects = PostQuerySet.as_manager()
 
     class Meta:
         """A meta class that configures additional parameters of the model."""
@@ -74,10 +141,55 @@ class Post(CreationPublishedModel):
         verbose_name = 'публикация'
         verbose_name_plural = 'Публикации'
         ordering = (Config.ORDER_BY_DATE_DESC,)
+        indexes = (
+            models.Index(
+                fields=('-pub_date', '-id'),
+                condition=models.Q(is_published=True),
+                name='post_visible_feed_idx'
+            ),
+            models.Index(
+                fields=('category', '-pub_date', '-id'),
+                condition=models.Q(is_published=True),
+                name='post_category_feed_idx'
+            ),
+            models.Index(
+                fields=('author', '-pub_date', '-id'),
+                name='post_author_feed_idx'
+            ),
+            models.Index(
+                fields=('-pub_date', '-id'),
+                name='post_pub_date_idx'
+            ),
+        )
 
     def __str__(self):
         return truncatechars(self.title, Config.TRUNCATION_LENGTH)
 
+    def save(self, *args, **kwargs):
+        """Save the post, refreshing the excerpt of its text if it is saved."""
+        update_fields = kwargs.get('update_fields')
+        if 'text' not in self.get_deferred_fields() and (
+                update_fields is None or 'text' in update_fields):
+            self.excerpt = make_excerpt(self.text)
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'excerpt'}
+        # A new image is measured by `create_thumbnails` once it is stored.
+        if ('image' not in self.get_deferred_fields()
+                and not getattr(self.image, '_committed', True)):
+            self.image_width = None
+            if update_fields is not None and 'image' in update_fields:
+                kwargs['update_fields'] = {
+                    *kwargs['update_fields'], 'image_width'
+                }
+        super().save(*args, **kwargs)
+
+    @property
+    def image_srcset(self):
+        """Get the `srcset` of the downscaled copies of the image."""
+        if not self.image:
+            return ''
+        return image_srcset(self.image, self.image_width)
+
 
 class Category(CreationPublishedModel):
     """Category model is used to organize posts into different categories."""
@@ -141,6 +253,12 @@ class Comment(models.Model):
         verbose_name = 'комментарий'
         verbose_name_plural = 'Комментарии'
         ordering = ('created_at',)
+        indexes = (
+            models.Index(
+                fields=('post', 'created_at', 'id'),
+                name='comment_post_created_idx'
+            ),
+        )
 
     def __str__(self):
         return truncatechars(self.text, Config.TRUNCATION_LENGTH)
@@ -0,0 +1,102 @@
+"""
+Set-based moderation of posts.
+
+Admin actions and the `moderate_posts` command change posts a batch of
+primary keys at a time, with one `UPDATE`, or one `DELETE` per table, for
+each batch and the row signal handlers muted. Each batch then retires the
+cache versions, the search index entries and the cached post counts it
+affected at once.
+"""
+from django.core.cache import cache
+from django.db import router, transaction
+from django.urls import reverse
+
+from blog.caching import bump_versions, version_key
+from blog.constants import Config
+from blog.models import Comment, Post
+from blog.search import reindex_posts, unindex_posts
+from blog.signals import muted_signals
+from blog.utils import count_cache_key
+
+
+def iter_batches(posts, batch_size):
+    """Yield primary keys of a post queryset in ascending batches."""
+    posts = posts.order_by('pk').values_list('pk', flat=True)
+    last_pk = 0
+    while True:
+        batch = list(posts.filter(pk__gt=last_pk)[:batch_size])
+        if not batch:
+            return
+        last_pk = batch[-1]
+        yield batch
+
+
+def count_paths(pks) -> set:
+    """Get the pages whose post counts the given posts take part in."""
+    paths = {reverse('blog:index')}
+    for slug, username in Post.objects.filter(pk__in=pks).values_list(
+            'category__slug', 'author__username').distinct():
+        if slug:
+            paths.add(reverse('blog:category_posts', args=(slug,)))
+        paths.add(reverse('blog:profile', args=(username,)))
+    return paths
+
+
+def invalidate_batch(pks, paths) -> None:
+    """Retire cached cards, pages and counts of changed posts."""
+    bump_versions(
+        [version_key('post', pk) for pk in pks] + [version_key('feed')]
+    )
+    cache.delete_many([count_cache_key(path) for path in paths])
+
+
+def apply_in_batches(posts, change, batch_size) -> int:
+    """Run `change` on each batch of a post queryset, return the total."""
+    using = router.db_for_write(Post)
+    total = 0
+    for batch in iter_batches(posts, batch_size):
+        paths = count_paths(batch)
+        with transaction.atomic(using=using), muted_signals():
+            change(Post.objects.using(using).filter(pk__in=batch))
+        invalidate_batch(batch, paths | count_paths(batch))
+        total += len(batch)
+    return total
+
+
+def publish_posts(posts, batch_size=Config.MODERATION_BATCH_SIZE) -> int:
+    """Publish posts."""
+    return apply_in_batches(
+        posts, lambda batch: batch.update(is_published=True), batch_size
+    )
+
+
+def unpublish_posts(posts, batch_size=Config.MODERATION_BATCH_SIZE) -> int:
+    """Hide posts."""
+    return apply_in_batches(
+        posts, lambda batch: batch.update(is_published=False), batch_size
+    )
+
+
+def move_posts(posts, category,
+               batch_size=Config.MODERATION_BATCH_SIZE) -> int:
+    """Move posts to a category."""
+    def move(batch):
+        batch.update(category=category)
+        reindex_posts(batch)
+    return apply_in_batches(posts, move, batch_size)
+
+
+def delete_posts(posts, batch_size=Config.MODERATION_BATCH_SIZE) -> int:
+    """
+    Delete posts with their comments.
+
+    `QuerySet.delete()` would load every row to send the delete signals
+    connected to these models, so the rows go with raw `DELETE` statements;
+    the muted handlers are made up for by `invalidate_batch`.
+    """
+    def delete(batch):
+        pks = list(batch.values_list('pk', flat=True))
+        Comment.objects.filter(post_id__in=pks)._raw_delete(batch.db)
+        Post.objects.filter(pk__in=pks)._raw_delete(batch.db)
+        unindex_posts(pks)
+    return apply_in_batches(posts, delete, batch_size)
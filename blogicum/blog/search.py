@@ -0,0 +1,187 @@
+"""
+Full-text search over posts.
+
+Post titles and texts are indexed together with the titles of their
+categories and the names of their locations, in a table of its own per
+database vendor: an FTS5 virtual table on SQLite, a `tsvector` column under
+a GIN index on PostgreSQL. Signal handlers reindex the posts whose indexed
+text changes. A search only picks post ids out of the index, so visibility
+stays with the `PostQuerySet` filters it is combined with.
+"""
+import re
+
+from django.db import connections, router
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+from blog.constants import Config
+from blog.models import Post
+
+SEARCH_TABLE = 'blog_post_search'
+
+SOURCE_SQL = (
+    'SELECT p.id, p.title, p.text, COALESCE(c.title, \'\'),'
+    ' COALESCE(l.name, \'\')'
+    ' FROM blog_post p'
+    ' LEFT JOIN blog_category c ON c.id = p.category_id'
+    ' LEFT JOIN blog_location l ON l.id = p.location_id'
+    ' WHERE p.id IN ({})'
+)
+
+
+def search_terms(query) -> list:
+    """Split a search query into lowercase words."""
+    return re.findall(r'\w+', query.lower())[:Config.SEARCH_MAX_TERMS]
+
+
+class SearchBackend:
+    """Search by `LIKE` scans, for databases without a full-text index."""
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def create_index(self) -> None:
+        """Create the index storage."""
+
+    def drop_index(self) -> None:
+        """Drop the index storage."""
+
+    def index(self, posts) -> None:
+        """Add or refresh the index entries of a post queryset."""
+
+    def remove(self, pks) -> None:
+        """Remove the index entries of posts by primary keys."""
+
+    def search(self, posts, terms):
+        """Keep posts that match every term."""
+        for term in terms:
+            posts = posts.filter(
+                Q(title__icontains=term) | Q(text__icontains=term)
+                | Q(category__title__icontains=term)
+                | Q(location__name__icontains=term)
+            )
+        return posts
+
+    def pk_sql(self, posts):
+        """Compile the primary keys of a post queryset into a subquery."""
+        return posts.order_by().values('pk').query.get_compiler(
+            connection=self.connection
+        ).as_sql()
+
+    def execute(self, *statements) -> None:
+        """Run `(sql, params)` statements."""
+        with self.connection.cursor() as cursor:
+            for sql, params in statements:
+                cursor.execute(sql, params)
+
+
+class SQLiteSearchBackend(SearchBackend):
+    """Search through an FTS5 virtual table keyed by post ids."""
+
+    def create_index(self):
+        self.execute((
+            f'CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5('
+            'title, text, category, location,'
+            ' tokenize=\'unicode61 remove_diacritics 2\')', ()
+        ))
+
+    def drop_index(self):
+        self.execute((f'DROP TABLE IF EXISTS {SEARCH_TABLE}', ()))
+
+    def index(self, posts):
+        sql, params = self.pk_sql(posts)
+        self.execute(
+            (f'DELETE FROM {SEARCH_TABLE} WHERE rowid IN ({sql})', params),
+            (f'INSERT INTO {SEARCH_TABLE}'
+             f'(rowid, title, text, category, location) '
+             + SOURCE_SQL.format(sql), params),
+        )
+
+    def remove(self, pks):
+        pks = list(pks)
+        if pks:
+            self.execute((
+                f'DELETE FROM {SEARCH_TABLE} WHERE rowid IN '
+                f'({", ".join(["%s"] * len(pks))})', pks
+            ))
+
+    def search(self, posts, terms):
+        match = ' '.join(f'"{term}"*' for term in terms)
+        return posts.filter(pk__in=RawSQL(
+            f'SELECT rowid FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH %s',
+            (match,)
+        ))
+
+
+class PostgresSearchBackend(SearchBackend):
+    """Search through `tsvector` documents under a GIN index."""
+
+    def create_index(self):
+        self.execute(
+            (f'CREATE TABLE IF NOT EXISTS {SEARCH_TABLE} ('
+             'post_id bigint PRIMARY KEY REFERENCES blog_post (id)'
+             ' ON DELETE CASCADE DEFERRABLE INITIALLY DEFERRED,'
+             ' document tsvector NOT NULL)', ()),
+            (f'CREATE INDEX IF NOT EXISTS {SEARCH_TABLE}_document_idx'
+             f' ON {SEARCH_TABLE} USING GIN (document)', ()),
+        )
+
+    def drop_index(self):
+        self.execute((f'DROP TABLE IF EXISTS {SEARCH_TABLE}', ()))
+
+    def index(self, posts):
+        sql, params = self.pk_sql(posts)
+        self.execute((
+            f'INSERT INTO {SEARCH_TABLE} (post_id, document)'
+            ' SELECT id, to_tsvector(%s::regconfig, concat_ws(\' \','
+            ' title, text, category, location))'
+            f' FROM ({SOURCE_SQL.format(sql)})'
+            ' AS source (id, title, text, category, location)'
+            ' ON CONFLICT (post_id) DO UPDATE'
+            ' SET document = EXCLUDED.document',
+            (Config.SEARCH_CONFIG, *params)
+        ))
+
+    def remove(self, pks):
+        pks = list(pks)
+        if pks:
+            self.execute((
+                f'DELETE FROM {SEARCH_TABLE} WHERE post_id = ANY(%s)', (pks,)
+            ))
+
+    def search(self, posts, terms):
+        return posts.filter(pk__in=RawSQL(
+            f'SELECT post_id FROM {SEARCH_TABLE}'
+            ' WHERE document @@ plainto_tsquery(%s::regconfig, %s)',
+            (Config.SEARCH_CONFIG, ' '.join(terms))
+        ))
+
+
+SEARCH_BACKENDS = {
+    'sqlite': SQLiteSearchBackend,
+    'postgresql': PostgresSearchBackend,
+}
+
+
+def get_search_backend(using) -> SearchBackend:
+    """Get the search backend of a database alias."""
+    connection = connections[using]
+    return SEARCH_BACKENDS.get(connection.vendor, SearchBackend)(connection)
+
+
+def search_posts(posts, query):
+    """Keep posts of a queryset that match a search query."""
+    terms = search_terms(query)
+    if not terms:
+        return posts.none()
+    return get_search_backend(posts.db).search(posts, terms)
+
+
+def reindex_posts(posts) -> None:
+    """Refresh the index entries of a post queryset."""
+    get_search_backend(router.db_for_write(Post)).index(posts)
+
+
+def unindex_posts(pks) -> None:
+    """Remove posts from the index."""
+    get_search_backend(router.db_for_write(Post)).remove(pks)
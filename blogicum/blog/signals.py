@@ -0,0 +1,203 @@
+"""
+Signal handlers of the blog app.
+
+They keep denormalized data and cache versions in sync with the rows they
+are derived from. Bulk operations mute them with `muted_signals()` and
+bring everything in sync once per batch instead.
+"""
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from django.db.models import F
+from django.db.models.signals import (
+    post_delete, post_save, pre_delete, pre_save
+)
+from django.dispatch import receiver
+
+from blog.caching import bump_versions, version_key
+from blog.constants import Config
+from blog.images import IMAGE_ERRORS, generate_thumbnails, has_thumbnails
+from blog.models import Category, Comment, Location, Post, User
+from blog.search import reindex_posts, unindex_posts
+from blog.validators import (
+    ForbiddenWord, invalidate_forbidden_words_matcher
+)
+
+logger = logging.getLogger(__name__)
+
+_muted = ContextVar('blog_signals_muted', default=False)
+
+
+@contextmanager
+def muted_signals():
+    """Skip the row handlers below in the current context."""
+    token = _muted.set(True)
+    try:
+        yield
+    finally:
+        _muted.reset(token)
+
+
+def unless_muted(handler):
+    """Make a signal handler do nothing while signals are muted."""
+    @wraps(handler)
+    def wrapper(*args, **kwargs):
+        if not _muted.get():
+            return handler(*args, **kwargs)
+    return wrapper
+
+
+@receiver(pre_save, sender=Comment)
+@unless_muted
+def check_comment_post(sender, instance, **kwargs):
+    """Note the post a saved comment belonged to, it may be moved."""
+    instance._previous_post_id = instance.pk and sender.objects.filter(
+        pk=instance.pk
+    ).values_list('post_id', flat=True).first()
+
+
+@receiver(post_save, sender=Comment)
+@unless_muted
+def increment_comment_count(sender, instance, created, **kwargs):
+    """Count a new or moved comment on its post, refresh the post's pages."""
+    previous_post_id = getattr(instance, '_previous_post_id', None)
+    moved = not created and previous_post_id not in (None, instance.post_id)
+    keys = [version_key('post', instance.post_id), version_key('feed')]
+    if created or moved:
+        Post.objects.filter(pk=instance.post_id).update(
+            comment_count=F('comment_count') + 1
+        )
+    if moved:
+        Post.objects.filter(pk=previous_post_id, comment_count__gt=0).update(
+            comment_count=F('comment_count') - 1
+        )
+        keys.append(version_key('post', previous_post_id))
+    bump_versions(keys)
+
+
+@receiver(post_delete, sender=Comment)
+@unless_muted
+def decrement_comment_count(sender, instance, **kwargs):
+    """Uncount a deleted comment on its post."""
+    Post.objects.filter(pk=instance.post_id, comment_count__gt=0).update(
+        comment_count=F('comment_count') - 1
+    )
+    bump_versions([
+        version_key('post', instance.post_id), version_key('feed')
+    ])
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+@unless_muted
+def bump_row_version(sender, instance, update_fields=None, **kwargs):
+    """Invalidate cached fragments rendered from the changed row."""
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+    keys = [version_key(sender._meta.model_name, instance.pk),
+            version_key('feed')]
+    if sender is User:
+        keys.append(version_key('user'))
+    bump_versions(keys)
+
+
+@receiver(post_save, sender=Post)
+@unless_muted
+def create_thumbnails(sender, instance, **kwargs):
+    """Measure and downscale a newly uploaded post image, if Pillow can."""
+    if not instance.image or has_thumbnails(
+            instance.image, instance.image_width):
+        return
+    try:
+        width = generate_thumbnails(instance.image)
+    except IMAGE_ERRORS:
+        logger.warning('Не удалось уменьшить изображение %s',
+                       instance.image.name, exc_info=True)
+        return
+    if width != instance.image_width:
+        Post.objects.filter(pk=instance.pk).update(image_width=width)
+        instance.image_width = width
+        bump_versions([version_key('post', instance.pk), version_key('feed')])
+
+
+SEARCH_POST_FIELDS = {
+    'title', 'text', 'category', 'category_id', 'location', 'location_id'
+}
+SEARCH_RELATED_FIELDS = {Category: 'title', Location: 'name'}
+
+
+@receiver(post_save, sender=Post)
+@unless_muted
+def index_post(sender, instance, update_fields=None, **kwargs):
+    """Refresh the search index entry of a saved post."""
+    if update_fields is None or SEARCH_POST_FIELDS & set(update_fields):
+        reindex_posts(Post.objects.filter(pk=instance.pk))
+
+
+@receiver(post_delete, sender=Post)
+@unless_muted
+def unindex_post(sender, instance, **kwargs):
+    """Drop a deleted post from the search index."""
+    unindex_posts([instance.pk])
+
+
+@receiver(pre_save, sender=Category)
+@receiver(pre_save, sender=Location)
+@unless_muted
+def check_indexed_name(sender, instance, **kwargs):
+    """Note whether the name the posts are indexed under changes."""
+    field = SEARCH_RELATED_FIELDS[sender]
+    instance._search_name_changed = instance.pk is not None and (
+        sender.objects.filter(pk=instance.pk).values_list(
+            field, flat=True
+        ).first() != getattr(instance, field)
+    )
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_save, sender=Location)
+@unless_muted
+def reindex_related_posts(sender, instance, **kwargs):
+    """Reindex the posts of a renamed category or location."""
+    if getattr(instance, '_search_name_changed', False):
+        reindex_posts(Post.objects.filter(
+            **{sender._meta.model_name: instance}
+        ))
+
+
+@receiver(pre_delete, sender=Category)
+@receiver(pre_delete, sender=Location)
+@unless_muted
+def reindex_orphaned_posts(sender, instance, **kwargs):
+    """
+    Detach and reindex the posts of a category or location being deleted.
+
+    They are set loose a batch of primary keys at a time, ahead of the
+    `SET_NULL` of the delete, since nothing tells them apart afterwards.
+    """
+    field = sender._meta.model_name
+    posts = Post.objects.filter(**{field: instance}).order_by('pk')
+    while True:
+        pks = list(posts.values_list('pk', flat=True)[
+            :Config.SEARCH_REINDEX_BATCH_SIZE
+        ])
+        if not pks:
+            break
+        batch = Post.objects.filter(pk__in=pks)
+        batch.update(**{field: None})
+        reindex_posts(batch)
+
+
+@receiver(post_save, sender=ForbiddenWord)
+@receiver(post_delete, sender=ForbiddenWord)
+def reset_forbidden_words(sender, **kwargs):
+    """Rebuild the forbidden words matcher after the list changes."""
+    invalidate_forbidden_words_matcher()
@@ -0,0 +1,164 @@
+"""
+Sitemaps of posts, categories and author profiles.
+
+Every section is split into chunks of `Config.SITEMAP_CHUNK_SIZE` primary
+keys, so a chunk stays under the 50 000 URL limit of the protocol and is
+read with a range scan of the primary key index. Chunks are written from
+`values_list().iterator()` a batch of lines at a time, so memory use does
+not grow with the number of rows. The chunk bounds of the index are
+cached under the feed version.
+"""
+from django.core.cache import cache
+from django.db.models import Max, Min, OuterRef, Q, Subquery
+from django.urls import reverse
+from django.urls.converters import SlugConverter
+from django.utils import timezone
+from django.utils.html import escape
+
+from blog.caching import get_versions, read_fresh_from_primary, version_key
+from blog.constants import Config
+from blog.models import Category, Post, User
+from blog.utils import get_feed_cache_timeout
+
+XML_HEADER = '<?xml version="1.0" encoding="UTF-8"?>\n'
+XML_NAMESPACE = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+URL_PLACEHOLDER = '1234567890'
+
+
+class SitemapSection:
+    """Pages of one kind listed in the sitemap."""
+
+    name = None
+    url_name = None
+    # Field of the URL argument, if the URL pattern takes it as a slug.
+    slug_field = None
+
+    def get_queryset(self):
+        """Get `(url argument, last modification)` rows of the section."""
+        raise NotImplementedError
+
+    def get_rows(self):
+        """Get the rows of the section whose pages have a URL."""
+        if self.slug_field is None:
+            return self.get_queryset()
+        return self.get_queryset().filter(Q(**{
+            f'{self.slug_field}__regex': f'^(?:{SlugConverter.regex})$'
+        }))
+
+    def chunk_numbers(self) -> range:
+        """Get the numbers of the chunks covering the section."""
+        bounds = self.get_rows().aggregate(first=Min('pk'), last=Max('pk'))
+        if bounds['first'] is None:
+            return range(0)
+        return range(bounds['first'] // Config.SITEMAP_CHUNK_SIZE,
+                     bounds['last'] // Config.SITEMAP_CHUNK_SIZE + 1)
+
+    def get_chunk(self, number):
+        """Get the rows of a chunk in primary key order."""
+        start = number * Config.SITEMAP_CHUNK_SIZE
+        return self.get_rows().filter(
+            pk__gte=start, pk__lt=start + Config.SITEMAP_CHUNK_SIZE
+        ).order_by('pk')
+
+    def url_template(self) -> str:
+        """Get the page path with `{}` in place of the URL argument."""
+        return reverse(self.url_name, args=(URL_PLACEHOLDER,)).replace(
+            URL_PLACEHOLDER, '{}'
+        )
+
+
+class PostSection(SitemapSection):
+    """Published posts."""
+
+    name = 'posts'
+    url_name = 'blog:post_detail'
+
+    def get_queryset(self):
+        return Post.objects.published().values_list('pk', 'pub_date')
+
+
+class CategorySection(SitemapSection):
+    """Published categories."""
+
+    name = 'categories'
+    url_name = 'blog:category_posts'
+    slug_field = 'slug'
+
+    def get_queryset(self):
+        return Category.objects.filter(is_published=True).annotate(
+            lastmod=Subquery(Post.objects.published().filter(
+                category=OuterRef('pk')
+            ).order_by('-pub_date').values('pub_date')[:1])
+        ).values_list('slug', 'lastmod')
+
+
+class ProfileSection(SitemapSection):
+    """Profiles of authors with published posts."""
+
+    name = 'profiles'
+    url_name = 'blog:profile'
+    slug_field = 'username'
+
+    def get_queryset(self):
+        return User.objects.annotate(
+            lastmod=Subquery(Post.objects.published().filter(
+                author=OuterRef('pk')
+            ).order_by('-pub_date').values('pub_date')[:1])
+        ).filter(lastmod__isnull=False).values_list('username', 'lastmod')
+
+
+SECTIONS = {
+    section.name: section
+    for section in (PostSection(), CategorySection(), ProfileSection())
+}
+
+
+def sitemap_path(section, number) -> str:
+    """Get the path of a sitemap chunk."""
+    return reverse('blog:sitemap_section', args=(section.name, number))
+
+
+def get_chunk_numbers() -> dict:
+    """Get the chunk numbers of all sections, cached per feed version."""
+    feed_key = version_key('feed')
+    version = get_versions([feed_key])[feed_key]
+    read_fresh_from_primary([version])
+    key = f'blog:sitemap:{version}'
+    numbers = cache.get(key)
+    if numbers is None:
+        numbers = {
+            name: section.chunk_numbers() for name, section in SECTIONS.items()
+        }
+        cache.set(key, numbers, get_feed_cache_timeout(timezone.now()))
+    return numbers
+
+
+def iter_sitemap_index(base_url, suffix=''):
+    """Yield the sitemap index listing every chunk of every section."""
+    yield f'{XML_HEADER}<sitemapindex xmlns="{XML_NAMESPACE}">\n'
+    chunk_numbers = get_chunk_numbers()
+    for section in SECTIONS.values():
+        for number in chunk_numbers[section.name]:
+            loc = escape(f'{base_url}{sitemap_path(section, number)}{suffix}')
+            yield f'<sitemap><loc>{loc}</loc></sitemap>\n'
+    yield '</sitemapindex>\n'
+
+
+def iter_urlset(section, number, base_url):
+    """Yield a sitemap chunk in batches of lines."""
+    yield f'{XML_HEADER}<urlset xmlns="{XML_NAMESPACE}">\n'
+    template = escape(base_url + section.url_template())
+    lines = []
+    for value, lastmod in section.get_chunk(number).iterator(
+            chunk_size=Config.SITEMAP_BATCH_SIZE):
+        lines.append(
+            f'<url><loc>{template.format(escape(value))}</loc>'
+            + (f'<lastmod>{lastmod.date().isoformat()}</lastmod>'
+               if lastmod else '')
+            + '</url>\n'
+        )
+        if len(lines) >= Config.SITEMAP_BATCH_SIZE:
+            yield ''.join(lines)
+            lines = []
+    lines.append('</urlset>\n')
+    yield ''.join(lines)
@@ -1,12 +1,18 @@
 """Blog URLs."""
 from django.urls import path
 
-from . import views
+from . import feeds, views
 
 app_name = 'blog'
 
 urlpatterns = [
     path('', views.PostListView.as_view(), name='index'),
+    path('rss/', feeds.PostsFeed(), name='rss'),
+    path('atom/', feeds.AtomPostsFeed(), name='atom'),
+    path('sitemap.xml', views.SitemapView.as_view(), name='sitemap'),
+    path('sitemap-<slug:section>-<int:number>.xml',
+         views.SitemapView.as_view(), name='sitemap_section'),
+    path('search/', views.PostSearchView.as_view(), name='search'),
     path(
         'posts/<int:post_id>/',
         views.PostDetailView.as_view(),
@@ -14,8 +20,16 @@ urlpatterns = [
     ),
     path('category/<slug:category_slug>/',
          views.CategoryDetailView.as_view(), name='category_posts'),
+    path('category/<slug:category_slug>/rss/', feeds.CategoryPostsFeed(),
+         name='category_rss'),
+    path('category/<slug:category_slug>/atom/',
+         feeds.AtomCategoryPostsFeed(), name='category_atom'),
     path('profile/<slug:username>/', views.UserProfileDetailView.as_view(),
          name='profile'),
+    path('profile/<slug:username>/rss/', feeds.AuthorPostsFeed(),
+         name='profile_rss'),
+    path('profile/<slug:username>/atom/', feeds.AtomAuthorPostsFeed(),
+         name='profile_atom'),
     path('edit_profile/', views.UserProfileUpdateView.as_view(),
          name='edit_profile'),
     path('posts/create/', views.PostCreateView.as_view(), name='create_post'),
@@ -25,6 +39,8 @@ urlpatterns = [
          name='delete_post'),
     path('posts/<int:post_id>/comment/', views.CommentCreateView.as_view(),
          name='add_comment'),
+    path('posts/<int:post_id>/comments/', views.PostCommentsView.as_view(),
+         name='comments'),
     path('posts/<int:post_id>/edit_comment/<int:comment_id>/',
          views.CommentUpdateView.as_view(), name='edit_comment'),
     path('posts/<int:post_id>/delete_comment/<int:comment_id>/',
@@ -0,0 +1,22 @@
+"""Blog URLs of the ASGI entry point, with async read-only views."""
+from django.urls import path
+
+from . import async_views
+from .urls import app_name, urlpatterns as sync_urlpatterns  # noqa: F401
+
+ASYNC_VIEWS = {
+    'index': async_views.PostListView,
+    'post_detail': async_views.PostDetailView,
+    'comments': async_views.PostCommentsView,
+    'category_posts': async_views.CategoryDetailView,
+    'profile': async_views.UserProfileDetailView,
+    'sitemap': async_views.SitemapView,
+    'sitemap_section': async_views.SitemapView,
+}
+
+urlpatterns = [
+    path(str(pattern.pattern), ASYNC_VIEWS[pattern.name].as_view(),
+         name=pattern.name)
+    if pattern.name in ASYNC_VIEWS else pattern
+    for pattern in sync_urlpatterns
+]
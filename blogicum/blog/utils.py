@@ -1,42 +1,252 @@
 """Business logic utilities."""
-import typing
+import hashlib
+import json
+import math
+from collections.abc import Sequence
 
-from django.db.models import Count
-from django.utils import timezone
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.paginator import Page, Paginator
+from django.db import connections
+from django.db.models import Min, Q
+from django.utils.functional import cached_property
+from django.utils.encoding import force_str
+from django.utils.http import urlsafe_base64_decode, urlsafe_base64_encode
 
+from blog.caching import get_versions, version_key
 from blog.constants import Config
 from blog.models import Post
 
-if typing.TYPE_CHECKING:
-    from django.db.models import QuerySet  # noqa TC002
-
-
-def get_posts(published=None, category=None,
-              author=None) -> 'QuerySet[Post]':
-    """Get queryset with filtered posts."""
-    queryset = Post.objects.prefetch_related(
-        'category',
-        'location',
-        'author'
-    ).select_related(
-        'author',
-        'category',
-        'location'
-    ).annotate(
-        comment_count=Count('comments')
-    ).order_by(Config.ORDER_BY_DATE_DESC)
-    if published is not None:
-        return queryset.filter(
-            pub_date__lte=timezone.now(),
-            is_published=True,
-            category__is_published=True
+CURSOR_NEXT = 'n'
+CURSOR_PREVIOUS = 'p'
+
+
+class KeysetPage(Sequence):
+    """A page of objects located by a keyset cursor instead of an OFFSET."""
+
+    is_keyset = True
+
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __repr__(self):
+        return f'<KeysetPage of {len(self)} objects>'
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        """Check there is a page after this one."""
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        """Check there is a page before this one."""
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        """Check there is a page before or after this one."""
+        return self.has_next() or self.has_previous()
+
+
+def encode_cursor(direction, obj, fields) -> str:
+    """Pack the ordering values of `obj` into an opaque cursor token."""
+    values = []
+    for name in fields:
+        value = getattr(obj, name)
+        values.append(value.isoformat() if hasattr(value, 'isoformat')
+                      else value)
+    payload = json.dumps([direction, values], separators=(',', ':'))
+    return urlsafe_base64_encode(payload.encode())
+
+
+def decode_cursor(cursor, model, fields):
+    """Unpack a cursor token, raise `ValueError` if it is malformed."""
+    try:
+        direction, raw_values = json.loads(
+            force_str(urlsafe_base64_decode(cursor))
         )
-    elif category is not None:
-        return queryset.filter(
-            category=category,
-            pub_date__lte=timezone.now(),
-            is_published=True
+    except (TypeError, ValueError, UnicodeDecodeError):
+        raise ValueError('Malformed cursor.')
+    if (direction not in (CURSOR_NEXT, CURSOR_PREVIOUS)
+            or not isinstance(raw_values, list)
+            or len(raw_values) != len(fields)):
+        raise ValueError('Malformed cursor.')
+    try:
+        values = [model._meta.get_field(name).to_python(value)
+                  for name, value in zip(fields, raw_values)]
+    except (TypeError, ValidationError):
+        raise ValueError('Malformed cursor.')
+    if None in values:
+        raise ValueError('Malformed cursor.')
+    return direction, values
+
+
+def keyset_filter(fields, values, descending) -> Q:
+    """Build a row-value comparison `(f1, f2, ...) < (v1, v2, ...)`."""
+    lookup = 'lt' if descending else 'gt'
+    condition = Q(**{f'{fields[-1]}__{lookup}': values[-1]})
+    for name, value in zip(reversed(fields[:-1]), reversed(values[:-1])):
+        condition = (
+            Q(**{f'{name}__{lookup}': value})
+            | (Q(**{name: value}) & condition)
         )
-    elif author is not None:
-        return queryset.filter(author=author)
-    return queryset
+    return condition
+
+
+def paginate_keyset(queryset, cursor, per_page,
+                    ordering=Config.FEED_KEYSET_ORDERING) -> KeysetPage:
+    """
+    Return the page of `queryset` that follows or precedes `cursor`.
+
+    All `ordering` fields must share one direction and the last one must be
+    unique, so every page costs a single indexed range scan of `per_page`
+    rows no matter how deep it is and no `COUNT(*)` is needed.
+    """
+    fields = [name.lstrip('-') for name in ordering]
+    descending = ordering[0].startswith('-')
+    direction, values = CURSOR_NEXT, None
+    if cursor:
+        direction, values = decode_cursor(cursor, queryset.model, fields)
+    backwards = direction == CURSOR_PREVIOUS
+    if backwards:
+        ordering = [name[1:] if name.startswith('-') else f'-{name}'
+                    for name in ordering]
+    queryset = queryset.order_by(*ordering)
+    if values is not None:
+        queryset = queryset.filter(
+            keyset_filter(fields, values, descending != backwards)
+        )
+    object_list = list(queryset[:per_page + 1])
+    has_more = len(object_list) > per_page
+    object_list = object_list[:per_page]
+    if backwards:
+        object_list.reverse()
+        has_next, has_previous = values is not None, has_more
+    else:
+        has_next, has_previous = has_more, values is not None
+    if not object_list:
+        return KeysetPage(object_list)
+    return KeysetPage(
+        object_list,
+        next_cursor=(encode_cursor(CURSOR_NEXT, object_list[-1], fields)
+                     if has_next else None),
+        previous_cursor=(encode_cursor(CURSOR_PREVIOUS, object_list[0],
+                                       fields)
+                         if has_previous else None),
+    )
+
+
+class CountedPaginator(Paginator):
+    """Paginator with the object count known in advance."""
+
+    def __init__(self, object_list, per_page, count, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.count = count
+
+
+def approximate_count(queryset, cache_key=None) -> int:
+    """
+    Count the rows of a queryset without an exact `COUNT(*)` every time.
+
+    PostgreSQL answers with the planner estimate once it is past
+    `Config.APPROXIMATE_COUNT_THRESHOLD`; smaller results and other
+    databases get an exact count, kept under `cache_key` for
+    `Config.COUNT_CACHE_TIMEOUT` seconds.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor == 'postgresql':
+        sql, params = queryset.order_by().values('pk').query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        estimate = int(plan[0]['Plan']['Plan Rows'])
+        if estimate >= Config.APPROXIMATE_COUNT_THRESHOLD:
+            return estimate
+    if cache_key is None:
+        return queryset.count()
+    return cache.get_or_set(
+        cache_key, queryset.count, Config.COUNT_CACHE_TIMEOUT
+    )
+
+
+def count_cache_key(path) -> str:
+    """Get the cache key of the approximate post count of a page."""
+    return f'blog:count:{hashlib.md5(path.encode()).hexdigest()}'
+
+
+class ApproximateCountPaginator(Paginator):
+    """Paginator counting objects with `approximate_count`."""
+
+    def __init__(self, object_list, per_page, cache_key=None, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.cache_key = cache_key
+
+    @cached_property
+    def count(self):
+        """Get the estimated number of objects."""
+        return approximate_count(self.object_list, self.cache_key)
+
+
+def elided_page_range(paginator, number) -> list:
+    """Get page numbers around `number` and at the ends, with gaps."""
+    return list(paginator.get_elided_page_range(
+        number,
+        on_each_side=Config.PAGE_RANGE_ON_EACH_SIDE,
+        on_ends=Config.PAGE_RANGE_ON_ENDS
+    ))
+
+
+def get_feed_cache_key(query_string, now) -> str:
+    """
+    Get the cache key of a published feed page.
+
+    The key changes with the feed version and with every time bucket.
+    """
+    feed_key = version_key('feed')
+    bucket = int(now.timestamp()) // Config.FEED_CACHE_BUCKET
+    digest = hashlib.md5(query_string.encode()).hexdigest()
+    return (f'blog:feed:{get_versions([feed_key])[feed_key]}:'
+            f'{bucket}:{digest}')
+
+
+def get_feed_cache_timeout(now) -> int:
+    """
+    Get the number of seconds a published feed page stays fresh.
+
+    It lasts until the end of the time bucket or until the next scheduled
+    post goes live, whichever comes first.
+    """
+    deadline = (
+        int(now.timestamp()) // Config.FEED_CACHE_BUCKET + 1
+    ) * Config.FEED_CACHE_BUCKET
+    next_publication = Post.objects.filter(
+        pub_date__gt=now,
+        is_published=True,
+        category__is_published=True
+    ).aggregate(Min('pub_date'))['pub_date__min']
+    if next_publication is not None:
+        deadline = min(deadline, next_publication.timestamp())
+    return max(1, math.ceil(deadline - now.timestamp()))
+
+
+def pack_page(paginator, page):
+    """Turn a paginated result into a picklable value."""
+    if paginator is None:
+        return page
+    return paginator.count, page.number, list(page.object_list)
+
+
+def unpack_page(packed, queryset, page_size):
+    """Restore `(paginator, page)` packed by `pack_page`."""
+    if isinstance(packed, KeysetPage):
+        return None, packed
+    count, number, object_list = packed
+    paginator = CountedPaginator(queryset, page_size, count)
+    return paginator, Page(object_list, number, paginator)
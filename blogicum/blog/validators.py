@@ -1,11 +1,16 @@
 import difflib
+import math
+from collections import Counter, defaultdict
 
 from django.core.exceptions import ValidationError
 from django.db import models
 from django.template.defaultfilters import truncatechars
 
+from blog.caching import bump_versions, get_versions, version_key
 from blog.constants import Config
 
+FORBIDDEN_WORDS_VERSION_KEY = version_key('forbidden_words')
+
 
 class ForbiddenWord(models.Model):
     """A ForbiddenWord model is used to store forbidden words."""
@@ -22,23 +27,142 @@ class ForbiddenWord(models.Model):
         return truncatechars(self.word, Config.TRUNCATION_LENGTH)
 
 
-def forbidden_words(value: str) -> None:
-    """Validate that a word is forbidden."""
-    words = set(map(str.lower, value.split()))
-    forbidden = set(
-        map(
-            str.lower,
-            ForbiddenWord.objects.all().values_list('word', flat=True)
+class ForbiddenWordsMatcher:
+    """
+    Forbidden words compiled for approximate matching.
+
+    A text token matches a forbidden word exactly when
+    `difflib.get_close_matches` would report it. Words are grouped by length,
+    so the `real_quick_ratio()` bound drops whole groups at once. Inside a
+    group, bitsets of "has at least k letters c" give every word's
+    `quick_ratio()` bound in a few big-integer operations, and only the
+    survivors pay for `SequenceMatcher.ratio()`.
+    """
+
+    def __init__(self, words, cutoff=Config.CUTOFF_POSSIBLE_SCORE):
+        self.cutoff = cutoff
+        grouped = defaultdict(list)
+        for word in set(words):
+            if word:
+                grouped[len(word)].append(word)
+        self._groups = {}
+        for length, group in grouped.items():
+            letters = defaultdict(int)
+            matchers = []
+            for position, word in enumerate(group):
+                for letter, count in Counter(word).items():
+                    for nth in range(1, count + 1):
+                        letters[letter, nth] |= 1 << position
+                matcher = difflib.SequenceMatcher()
+                matcher.set_seq2(word)
+                matchers.append(matcher)
+            self._groups[length] = (group, matchers, dict(letters))
+        self._token_matches = {}
+
+    def __bool__(self):
+        return bool(self._groups)
+
+    def _required_matches(self, total_length):
+        """Return the fewest matching letters that reach the cutoff."""
+        required = math.ceil(self.cutoff * total_length / 2)
+        while required > 0 and 2.0 * (required - 1) / total_length >= (
+                self.cutoff):
+            required -= 1
+        while 2.0 * required / total_length < self.cutoff:
+            required += 1
+        return required
+
+    def _candidates(self, token_letters, token_length, length):
+        """Return a bitset of group words whose `quick_ratio()` passes."""
+        group, _, letters = self._groups[length]
+        allowed_misses = token_length - self._required_matches(
+            token_length + length
         )
-    )
-    restricted_words = tuple(
-        item for item in forbidden
-        if difflib.get_close_matches(
-            item,
-            words,
-            n=Config.CLOSE_MATCH_NUM,
-            cutoff=Config.CUTOFF_POSSIBLE_SCORE
+        if allowed_misses < 0:
+            return 0
+        within = [(1 << len(group)) - 1] * (allowed_misses + 1)
+        for letter in token_letters:
+            present = letters.get(letter, 0)
+            for misses in range(allowed_misses, 0, -1):
+                within[misses] = (
+                    (within[misses] & present) | within[misses - 1]
+                )
+            within[0] &= present
+            if not within[allowed_misses]:
+                break
+        return within[allowed_misses]
+
+    def match_token(self, token):
+        """Return the forbidden words close to `token`."""
+        matches = self._token_matches.get(token)
+        if matches is not None:
+            return matches
+        token_length = len(token)
+        token_letters = [
+            (letter, nth) for letter, count in Counter(token).items()
+            for nth in range(1, count + 1)
+        ]
+        found = []
+        for length, (group, matchers, _) in self._groups.items():
+            if (2.0 * min(length, token_length) / (length + token_length)
+                    < self.cutoff):
+                continue
+            candidates = self._candidates(token_letters, token_length, length)
+            while candidates:
+                lowest = candidates & -candidates
+                position = lowest.bit_length() - 1
+                candidates ^= lowest
+                matcher = matchers[position]
+                matcher.set_seq1(token)
+                if matcher.ratio() >= self.cutoff:
+                    found.append(group[position])
+        matches = frozenset(found)
+        if len(self._token_matches) >= Config.FORBIDDEN_MATCH_CACHE_SIZE:
+            self._token_matches.clear()
+        self._token_matches[token] = matches
+        return matches
+
+    def find(self, tokens):
+        """Return the forbidden words close to any of `tokens`."""
+        restricted = set()
+        for token in tokens:
+            restricted |= self.match_token(token)
+        return restricted
+
+
+_matcher = None
+_matcher_version = None
+
+
+def get_forbidden_words_matcher():
+    """Return the process-wide matcher, rebuilt when the word list changes."""
+    global _matcher, _matcher_version
+    version = get_versions(
+        [FORBIDDEN_WORDS_VERSION_KEY]
+    )[FORBIDDEN_WORDS_VERSION_KEY]
+    if _matcher is None or version != _matcher_version:
+        _matcher = ForbiddenWordsMatcher(
+            map(str.lower, ForbiddenWord.objects.values_list('word',
+                                                             flat=True))
         )
+        _matcher_version = version
+    return _matcher
+
+
+def invalidate_forbidden_words_matcher():
+    """Make every process rebuild its matcher on next validation."""
+    global _matcher
+    _matcher = None
+    bump_versions([FORBIDDEN_WORDS_VERSION_KEY])
+
+
+def forbidden_words(value: str) -> None:
+    """Validate that a word is forbidden."""
+    matcher = get_forbidden_words_matcher()
+    if not matcher:
+        return
+    restricted_words = sorted(
+        matcher.find(set(map(str.lower, value.split())))
     )
     if restricted_words:
         raise ValidationError(
@@ -2,70 +2,314 @@
 from django.contrib.auth import login
 from django.contrib.auth.forms import UserCreationForm
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
-from django.http import Http404
+from django.core.cache import cache, caches
+from django.core.paginator import InvalidPage
+from django.http import Http404, HttpResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404, redirect
 from django.urls import reverse_lazy, reverse
 from django.utils import timezone
+from django.views.decorators.http import condition
 from django.views.generic import (
-    ListView, DetailView, CreateView, UpdateView, DeleteView
+    ListView, DetailView, CreateView, UpdateView, DeleteView, View
 )
 from django.views.generic.list import MultipleObjectMixin
 
+from blog.caching import (
+    attach_card_versions, card_cache_timeout, get_versions, make_etag,
+    page_cache_key, read_fresh_from_primary, version_datetime, version_key
+)
 from blog.forms import PostForm, CommentsForm
 from blog.models import Category, Post, User, Comment
-from blog.utils import get_posts
+from blog.search import search_posts
+from blog.sitemaps import SECTIONS, iter_sitemap_index, iter_urlset
+from blog.utils import (
+    ApproximateCountPaginator, count_cache_key, elided_page_range,
+    get_feed_cache_key, get_feed_cache_timeout, pack_page, paginate_keyset,
+    unpack_page
+)
 from blog.constants import Config
 
 
-class IsAuthorMixin(UserPassesTestMixin):
+class ObjectCacheMixin:
+    """Mixin for resolving the object of a view once per request."""
+
+    def get_object(self, queryset=None):
+        """Get the object, fetching it on the first call only."""
+        if queryset is not None:
+            return super().get_object(queryset)
+        if not hasattr(self, '_object'):
+            self._object = super().get_object()
+        return self._object
+
+
+class IsAuthorMixin(ObjectCacheMixin, UserPassesTestMixin):
     """Mixin for checking if a user is authenticated."""
 
     def test_func(self):
         """Check user is author."""
-        return self.get_object().author == self.request.user
+        return self.get_object().author_id == self.request.user.pk
 
     def handle_no_permission(self):
         """Redirect to login page if a user is not authenticated."""
         return redirect('blog:post_detail', post_id=self.kwargs['post_id'])
 
 
-class PostListView(ListView):
+class ConditionalGetMixin:
+    """Mixin for answering unchanged pages with 304 Not Modified."""
+
+    def get_validators(self):
+        """Get the version keys and the latest publication of the page."""
+        return [version_key('feed')], None
+
+    def get_conditional_validators(self):
+        """Get the ETag and, for anonymous users, the Last-Modified date."""
+        keys, published_at = self.get_validators()
+        versions = get_versions(keys)
+        stamps = [versions[key] for key in keys]
+        read_fresh_from_primary(stamps)
+        self.etag = make_etag(self.request.user.pk,
+                              self.request.GET.urlencode(), stamps,
+                              published_at)
+        last_modified = None
+        if not self.request.user.is_authenticated:
+            last_modified = max(
+                [version_datetime(stamp) for stamp in stamps]
+                + [published_at] * bool(published_at)
+            )
+        return self.etag, last_modified
+
+    def get(self, request, *args, **kwargs):
+        """Check validators before running any page query."""
+        etag, last_modified = self.get_conditional_validators()
+        return condition(
+            etag_func=lambda *args, **kwargs: etag,
+            last_modified_func=lambda *args, **kwargs: last_modified
+        )(super().get)(request, *args, **kwargs)
+
+
+class AnonymousPageCacheMixin:
+    """
+    Mixin for serving whole pages to anonymous visitors from the cache.
+
+    Pages are stored under their path and ETag, which digests the versions
+    of the rows they were rendered from, so a signal bumping any of those
+    versions retires the page. Must follow `ConditionalGetMixin`.
+    """
+
+    def get(self, request, *args, **kwargs):
+        """Serve the page from the cache, caching it if it is public."""
+        if request.user.is_authenticated:
+            return super().get(request, *args, **kwargs)
+        page_cache = caches[Config.PAGE_CACHE_ALIAS]
+        key = page_cache_key(request.path, self.etag)
+        response = page_cache.get(key)
+        if response is None:
+            response = super().get(request, *args, **kwargs)
+            if hasattr(response, 'render'):
+                response.render()
+            if self.is_cacheable(request, response):
+                page_cache.set(key, response, Config.PAGE_CACHE_TIMEOUT)
+        return response
+
+    def is_cacheable(self, request, response):
+        """Check a response holds nothing private to the visitor."""
+        return (
+            response.status_code == 200
+            and not response.cookies
+            and not request.META.get('CSRF_COOKIE_USED')
+            and 'private' not in response.get('Cache-Control', '')
+        )
+
+
+class KeysetPaginationMixin:
+    """
+    Mixin for paging post feeds.
+
+    Pages go by `(pub_date, id)` cursors in keyset mode and by number
+    otherwise, with an elided page range and, optionally, approximate counts.
+    """
+
+    keyset_pagination = Config.KEYSET_PAGINATION
+    cursor_kwarg = Config.CURSOR_QUERY_PARAM
+    approximate_count = Config.APPROXIMATE_COUNT
+
+    def get_paginator(self, queryset, per_page, **kwargs):
+        """Get a paginator that estimates the count if configured to."""
+        if not self.approximate_count:
+            return super().get_paginator(queryset, per_page, **kwargs)
+        return ApproximateCountPaginator(
+            queryset, per_page, count_cache_key(self.request.path), **kwargs
+        )
+
+    def paginate_queryset(self, queryset, page_size):
+        """Paginate by cursor in keyset mode, by page number otherwise."""
+        cursor = self.request.GET.get(self.cursor_kwarg)
+        if self.keyset_pagination or cursor:
+            page = self.get_keyset_page(queryset, cursor, page_size)
+            return None, page, page.object_list, page.has_other_pages()
+        paginator = self.get_paginator(
+            queryset, page_size, orphans=self.get_paginate_orphans(),
+            allow_empty_first_page=self.get_allow_empty()
+        )
+        page = self.get_numbered_page(
+            paginator, self.get_page_number(paginator)
+        )
+        return paginator, page, page.object_list, page.has_other_pages()
+
+    def get_keyset_page(self, queryset, cursor, page_size):
+        """Get the page that follows or precedes the cursor."""
+        try:
+            return paginate_keyset(queryset, cursor, page_size)
+        except ValueError:
+            raise Http404('Неверная страница')
+
+    def get_page_number(self, paginator) -> int:
+        """Get the requested page number, counting pages for `last` only."""
+        number = (self.kwargs.get(self.page_kwarg)
+                  or self.request.GET.get(self.page_kwarg) or 1)
+        if number == 'last':
+            return paginator.num_pages
+        try:
+            number = int(number)
+        except ValueError:
+            raise Http404('Неверная страница')
+        if number < 1:
+            raise Http404('Неверная страница')
+        return number
+
+    def get_numbered_page(self, paginator, number, object_list=None):
+        """Get a page by number, reusing its rows if already fetched."""
+        try:
+            paginator.validate_number(number)
+        except InvalidPage:
+            raise Http404('Неверная страница')
+        if object_list is None:
+            return paginator.page(number)
+        return paginator._get_page(object_list, number, paginator)
+
+    def get_page_query(self) -> str:
+        """Get the query string prefix of links to other pages."""
+        query = self.request.GET.copy()
+        query.pop(self.page_kwarg, None)
+        query.pop(self.cursor_kwarg, None)
+        return f'{query.urlencode()}&' if query else ''
+
+    def get_context_data(self, **kwargs):
+        """Add the elided page range of numbered pages."""
+        context = super().get_context_data(**kwargs)
+        context['page_query'] = self.get_page_query()
+        paginator = context.get('paginator')
+        if paginator is not None:
+            context['page_range'] = elided_page_range(
+                paginator, context['page_obj'].number
+            )
+        return context
+
+
+class CachedPostCardsMixin:
+    """Mixin for stamping feed posts with their card cache version."""
+
+    def get_context_data(self, **kwargs):
+        """Attach card versions to the posts of the page."""
+        context = super().get_context_data(**kwargs)
+        versions = attach_card_versions(context['page_obj'])
+        context['card_cache_timeout'] = card_cache_timeout(versions)
+        return context
+
+
+class PostListView(ConditionalGetMixin, AnonymousPageCacheMixin,
+                   CachedPostCardsMixin, KeysetPaginationMixin, ListView):
     """View for listing posts."""
 
     template_name = 'blog/index.html'
     context_object_name = 'post_list'
     paginate_by = Config.POST_PER_PAGE
-    queryset = get_posts(published=True)
-
 
-class PostDetailView(DetailView):
+    def get_validators(self):
+        """Get the feed version and the latest published post date."""
+        return [version_key('feed')], Post.objects.published().values_list(
+            'pub_date', flat=True
+        ).first()
+
+    def get_queryset(self):
+        """Get posts published by the time of the request."""
+        self.now = timezone.now()
+        return Post.objects.published(self.now).card_columns()
+
+    def paginate_queryset(self, queryset, page_size):
+        """Serve the page from the time-bucketed feed cache."""
+        key = get_feed_cache_key(self.request.GET.urlencode(), self.now)
+        packed = cache.get(key)
+        if packed is None:
+            paginator, page, _, _ = super().paginate_queryset(
+                queryset, page_size
+            )
+            packed = pack_page(paginator, page)
+            cache.set(key, packed, get_feed_cache_timeout(self.now))
+        paginator, page = unpack_page(packed, queryset, page_size)
+        return paginator, page, page.object_list, page.has_other_pages()
+
+
+class PostDetailView(ConditionalGetMixin, AnonymousPageCacheMixin,
+                     ObjectCacheMixin, DetailView):
     """View for showing post-details."""
 
     template_name = 'blog/detail.html'
     context_object_name = 'post'
     pk_url_kwarg = 'post_id'
-    queryset = get_posts()
 
-    def get_object(self, queryset=None):
-        """Get post-object."""
-        post = super().get_object(queryset)
-        if ((
-                post.is_published
-                and post.category.is_published
-                and post.pub_date <= timezone.now())
-                or self.request.user == post.author):
-            return post
-        raise Http404('Пост не найден')
+    def get_queryset(self):
+        """Get the posts the user may see, with the rendered columns only."""
+        return Post.objects.visible_to(self.request.user).detail_columns()
+
+    def get_validators(self):
+        """Get versions of the rows the post page is rendered from."""
+        post_id = self.kwargs[self.pk_url_kwarg]
+        row = Post.objects.filter(pk=post_id).values_list(
+            'author_id', 'category_id', 'location_id', 'pub_date'
+        ).first()
+        if row is None:
+            return [version_key('post', post_id)], None
+        author_id, category_id, location_id, pub_date = row
+        return [
+            version_key('post', post_id),
+            version_key('user', author_id),
+            version_key('category', category_id),
+            version_key('location', location_id),
+            version_key('user'),
+        ], pub_date
 
     def get_context_data(self, **kwargs):
         """Get post-context."""
         context = super().get_context_data(**kwargs)
         context['form'] = CommentsForm()
-        context['comments'] = self.object.comments.select_related('author')
+        context['comments'] = self.get_comments_page()
         return context
 
+    def get_comments_page(self):
+        """Get the batch of comments that follows the requested cursor."""
+        try:
+            return paginate_keyset(
+                Comment.objects.filter(
+                    post=self.kwargs[self.pk_url_kwarg]
+                ).select_related('author'),
+                self.request.GET.get(Config.CURSOR_QUERY_PARAM),
+                Config.COMMENTS_PER_PAGE,
+                ordering=Config.COMMENT_KEYSET_ORDERING
+            )
+        except ValueError:
+            raise Http404('Неверная страница')
+
+
+class PostCommentsView(PostDetailView):
+    """View for rendering the next batch of post comments."""
+
+    template_name = 'includes/comment_list.html'
 
-class CategoryDetailView(DetailView, MultipleObjectMixin):
+
+class CategoryDetailView(ConditionalGetMixin, AnonymousPageCacheMixin,
+                         CachedPostCardsMixin, KeysetPaginationMixin,
+                         ObjectCacheMixin, DetailView, MultipleObjectMixin):
     """View for showing category details."""
 
     template_name = 'blog/category.html'
@@ -73,31 +317,39 @@ class CategoryDetailView(DetailView, MultipleObjectMixin):
     queryset = Category.objects.filter(is_published=True)
     paginate_by = Config.POST_PER_PAGE
 
+    def get_validators(self):
+        """Get the feed version and the latest post date in the category."""
+        return [version_key('feed')], Post.objects.filter(
+            category__slug=self.kwargs[self.slug_url_kwarg],
+            is_published=True,
+            pub_date__lte=timezone.now()
+        ).values_list('pub_date', flat=True).first()
+
     def get_context_data(self, **kwargs):
         """Get category context."""
-        category = self.get_object()
-        post_list = get_posts(category=category)
+        post_list = Post.objects.published().for_category(
+            self.object
+        ).card_columns()
         context = super(CategoryDetailView, self).get_context_data(
             object_list=post_list, **kwargs)
         return context
 
 
-class UserProfileDetailView(DetailView, MultipleObjectMixin):
+class UserProfileDetailView(ConditionalGetMixin, AnonymousPageCacheMixin,
+                            CachedPostCardsMixin, KeysetPaginationMixin,
+                            ObjectCacheMixin, DetailView, MultipleObjectMixin):
     """View for showing user profile details."""
 
     template_name = 'blog/profile.html'
+    model = User
+    slug_field = 'username'
     slug_url_kwarg = 'username'
     paginate_by = Config.POST_PER_PAGE
 
-    def get_object(self, **kwargs):
-        """Get user profile object."""
-        return get_object_or_404(User,
-                                 username=self.kwargs[self.slug_url_kwarg])
-
     def get_context_data(self, **kwargs):
         """Get user profile context."""
-        author = self.get_object()
-        post_list = get_posts(author=author)
+        author = self.object
+        post_list = Post.objects.by_author(author).card_columns()
         context = super(UserProfileDetailView, self).get_context_data(
             object_list=post_list, **kwargs
         )
@@ -106,6 +358,51 @@ class UserProfileDetailView(DetailView, MultipleObjectMixin):
         return context
 
 
+class PostSearchView(CachedPostCardsMixin, KeysetPaginationMixin, ListView):
+    """View for searching published posts."""
+
+    template_name = 'blog/search.html'
+    context_object_name = 'post_list'
+    paginate_by = Config.POST_PER_PAGE
+    query_kwarg = Config.SEARCH_QUERY_PARAM
+    # The count of matches is bounded by the query, not by the table size.
+    approximate_count = False
+
+    def get_queryset(self):
+        """Get published posts matching the search query."""
+        self.query = self.request.GET.get(self.query_kwarg, '').strip()
+        return search_posts(
+            Post.objects.published().card_columns(), self.query
+        )
+
+    def get_context_data(self, **kwargs):
+        """Add the search query."""
+        context = super().get_context_data(**kwargs)
+        context['query'] = self.query
+        return context
+
+
+class SitemapView(View):
+    """View for streaming the sitemap index and its chunks."""
+
+    streaming = True
+
+    def get(self, request, section=None, number=None):
+        """Stream the index, or a chunk when a section is given."""
+        base_url = request.build_absolute_uri('/').rstrip('/')
+        if section is None:
+            content = iter_sitemap_index(base_url)
+        elif section in SECTIONS:
+            content = iter_urlset(SECTIONS[section], number, base_url)
+        else:
+            raise Http404('Нет такого раздела карты сайта')
+        if self.streaming:
+            return StreamingHttpResponse(
+                content, content_type='application/xml'
+            )
+        return HttpResponse(''.join(content), content_type='application/xml')
+
+
 class UserProfileUpdateView(LoginRequiredMixin, UpdateView):
     """View for updating user profile."""
 
@@ -163,12 +460,9 @@ class PostUpdateView(LoginRequiredMixin, IsAuthorMixin, UpdateView):
 
     form_class = PostForm
     template_name = 'blog/create.html'
+    queryset = Post.objects.select_related('location')
     pk_url_kwarg = 'post_id'
 
-    def get_object(self, **kwargs):
-        """Get post object."""
-        return get_object_or_404(Post, id=self.kwargs['post_id'])
-
     def form_valid(self, form):
         """Validate form."""
         form.instance.author = self.request.user
@@ -184,17 +478,15 @@ class PostDeleteView(LoginRequiredMixin, IsAuthorMixin, DeleteView):
     """View for deleting post."""
 
     template_name = 'blog/create.html'
+    queryset = Post.objects.select_related('location')
+    pk_url_kwarg = 'post_id'
 
     def get_context_data(self, **kwargs):
         """Get post context."""
         context = super().get_context_data(**kwargs)
-        context["form"] = PostForm(instance=self.get_object())
+        context["form"] = PostForm(instance=self.object)
         return context
 
-    def get_object(self, **kwargs):
-        """Get post object."""
-        return get_object_or_404(Post, id=self.kwargs['post_id'])
-
     def get_success_url(self):
         """Redirect to user profile page."""
         return reverse_lazy('blog:profile',
@@ -224,29 +516,17 @@ class CommentUpdateView(LoginRequiredMixin, IsAuthorMixin, UpdateView):
     """View for comment update."""
 
     model = Comment
-    queryset = Comment.objects.select_related('author')
     form_class = CommentsForm
     template_name = 'blog/comment.html'
     context_object_name = 'comment'
     pk_url_kwarg = 'comment_id'
-    comment = None
-    comment_id = None
-    post_id = None
-
-    def dispatch(self, request, *args, **kwargs):
-        """Dispatch func."""
-        self.post_id = self.kwargs['post_id']
-        self.comment_id = self.kwargs['comment_id']
-        self.comment = get_object_or_404(Comment, id=self.comment_id)
-        return super().dispatch(request, *args, **kwargs)
 
     def get_context_data(self, **kwargs):
         """Get post context."""
         context = super().get_context_data(**kwargs)
         context.update({
-            'post_id': self.post_id,
-            'comment_id': self.comment_id,
-            'comment': self.comment,
+            'post_id': self.kwargs['post_id'],
+            'comment_id': self.kwargs['comment_id'],
         })
         return context
 
@@ -257,17 +537,16 @@ class CommentUpdateView(LoginRequiredMixin, IsAuthorMixin, UpdateView):
 
     def get_success_url(self):
         """Redirect to post page."""
-        return reverse('blog:post_detail', kwargs={'post_id': self.post_id})
+        return reverse('blog:post_detail',
+                       kwargs={'post_id': self.kwargs['post_id']})
 
 
 class CommentDeleteView(LoginRequiredMixin, IsAuthorMixin, DeleteView):
     """View for comment delete."""
 
+    model = Comment
     template_name = 'blog/comment.html'
-
-    def get_object(self, **kwargs):
-        """Get post object."""
-        return get_object_or_404(Comment, id=self.kwargs['comment_id'])
+    pk_url_kwarg = 'comment_id'
 
     def get_success_url(self):
         """Redirect to post page."""
@@ -0,0 +1,71 @@
+"""
+Cache configuration of blogicum read from the environment.
+
+Version stamps of the blog live in the `default` cache, so every worker
+process has to share it: use `file`, `memcached` or `redis` whenever the
+site runs in more than one process. Importing this module registers a
+system check that warns when a production cache lives in local memory.
+"""
+import os
+import posixpath
+
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+
+CACHE_BACKENDS = {
+    'locmem': 'django.core.cache.backends.locmem.LocMemCache',
+    'file': 'django.core.cache.backends.filebased.FileBasedCache',
+    'memcached': 'django.core.cache.backends.memcached.PyMemcacheCache',
+    'redis': 'django_redis.cache.RedisCache',
+}
+
+
+def caches_from_env(prefix='CACHE', default=None) -> dict:
+    """
+    Build `CACHES` from `<prefix>_*` environment variables.
+
+    `<prefix>_BACKEND` is one of `CACHE_BACKENDS` or a dotted backend path,
+    `<prefix>_LOCATION` its location. Whole pages go to the `pages` alias
+    on the same server under their own key prefix.
+    """
+    backend = os.getenv(f'{prefix}_BACKEND', '').strip()
+    if not backend:
+        return dict(default or {})
+    backend = CACHE_BACKENDS.get(backend, backend)
+    location = os.getenv(f'{prefix}_LOCATION', '')
+    pages_location = location
+    if backend == CACHE_BACKENDS['file']:
+        pages_location = posixpath.join(location, 'pages')
+    elif backend == CACHE_BACKENDS['locmem']:
+        pages_location = f'{location}pages'
+    return {
+        'default': {
+            'BACKEND': backend,
+            'LOCATION': location,
+            'KEY_PREFIX': 'blogicum',
+        },
+        'pages': {
+            'BACKEND': backend,
+            'LOCATION': pages_location,
+            'KEY_PREFIX': 'blogicum-pages',
+        },
+    }
+
+
+@register(Tags.caches)
+def check_shared_caches(app_configs, **kwargs) -> list:
+    """Warn when a cache of a production site is local to one process."""
+    if settings.DEBUG:
+        return []
+    return [
+        Warning(
+            f'Кеш `{alias}` хранится в памяти процесса.',
+            hint=(
+                'Процессы не узнают об изменениях друг друга: задайте'
+                ' CACHE_BACKEND=file, memcached или redis.'
+            ),
+            id='blogicum.W001',
+        )
+        for alias, config in settings.CACHES.items()
+        if config['BACKEND'] == CACHE_BACKENDS['locmem']
+    ]
@@ -0,0 +1,80 @@
+"""
+Database configuration of blogicum read from the environment.
+
+`blogicum.db` is also a database backend: PostgreSQL with the connection
+health checks of newer Django versions and an optional in-process pool.
+"""
+import os
+
+TRUE_VALUES = ('1', 'true', 'yes', 'on')
+
+
+def env_bool(name, default=False) -> bool:
+    """Read a boolean flag from the environment."""
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in TRUE_VALUES
+
+
+def env_int(name, default=None):
+    """Read an integer from the environment, empty meaning `default`."""
+    value = os.getenv(name, '').strip()
+    return int(value) if value else default
+
+
+def database_from_env(prefix='DB', default=None) -> dict:
+    """
+    Build a `DATABASES` entry from `<prefix>_*` environment variables.
+
+    `<prefix>_ENGINE=postgresql` selects PostgreSQL, configured by `_NAME`,
+    `_USER`, `_PASSWORD`, `_HOST` and `_PORT`. `_CONN_MAX_AGE` keeps
+    connections open between requests (`none` for no limit),
+    `_CONN_HEALTH_CHECKS` pings a reused connection before its first query
+    in a request, and `_POOL_MAX_SIZE` hands connections out from a
+    per-process pool of that size instead of opening new ones; a request
+    finding the pool empty waits `_POOL_TIMEOUT` seconds for a connection.
+    """
+    engine = os.getenv(f'{prefix}_ENGINE', '').strip().lower()
+    if engine != 'postgresql':
+        return dict(default or {})
+    max_age = os.getenv(f'{prefix}_CONN_MAX_AGE', '60').strip().lower()
+    pool_size = env_int(f'{prefix}_POOL_MAX_SIZE')
+    return {
+        'ENGINE': 'blogicum.db',
+        'NAME': os.getenv(f'{prefix}_NAME', 'blogicum'),
+        'USER': os.getenv(f'{prefix}_USER', 'blogicum'),
+        'PASSWORD': os.getenv(f'{prefix}_PASSWORD', ''),
+        'HOST': os.getenv(f'{prefix}_HOST', 'localhost'),
+        'PORT': os.getenv(f'{prefix}_PORT', '5432'),
+        'CONN_MAX_AGE': None if max_age == 'none' else int(max_age),
+        'CONN_HEALTH_CHECKS': env_bool(f'{prefix}_CONN_HEALTH_CHECKS', True),
+        'POOL': pool_size and {
+            'MIN_SIZE': env_int(f'{prefix}_POOL_MIN_SIZE', 1),
+            'MAX_SIZE': pool_size,
+            'TIMEOUT': env_int(f'{prefix}_POOL_TIMEOUT', 10),
+        },
+        'OPTIONS': {
+            'connect_timeout': env_int(f'{prefix}_CONNECT_TIMEOUT', 5),
+        },
+    }
+
+
+def replicas_from_env(primary, prefix='DB') -> dict:
+    """
+    Build `DATABASES` entries of the read replicas of `primary`.
+
+    `<prefix>_REPLICA_HOSTS` lists `host[:port]` pairs separated by commas;
+    every replica shares the rest of the settings with the primary.
+    """
+    replicas = {}
+    hosts = os.getenv(f'{prefix}_REPLICA_HOSTS', '').split(',')
+    for number, address in enumerate(filter(None, map(str.strip, hosts)), 1):
+        host, _, port = address.partition(':')
+        replicas[f'replica_{number}'] = {
+            **primary,
+            'HOST': host,
+            'PORT': port or primary.get('PORT', ''),
+            'TEST': {'MIRROR': 'default'},
+        }
+    return replicas
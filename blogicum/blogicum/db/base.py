@@ -0,0 +1,165 @@
+"""
+PostgreSQL backend with health-checked reuse and an optional pool.
+
+Django 3.2 has neither `CONN_HEALTH_CHECKS` nor connection pools. With
+`CONN_HEALTH_CHECKS` a connection kept by `CONN_MAX_AGE` is checked once per
+request, before its first query, so a server restart costs one failed ping
+instead of a 500. With `POOL` physical connections live in a process-wide
+thread-safe pool: closing a Django connection returns it there, which
+serves both the worker threads of gunicorn and the thread executor that
+runs sync views under ASGI. When every pooled connection is taken, a
+thread waits up to `POOL['TIMEOUT']` seconds for one to come back.
+"""
+import os
+import threading
+
+import psycopg2.extras
+from django.db.backends.postgresql import base
+from psycopg2 import pool as psycopg2_pool
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+class BlockingConnectionPool(psycopg2_pool.ThreadedConnectionPool):
+    """Thread-safe pool whose `getconn` waits for a free connection."""
+
+    def __init__(self, minconn, maxconn, timeout, *args, **kwargs):
+        super().__init__(minconn, maxconn, *args, **kwargs)
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(maxconn)
+
+    def getconn(self, key=None):
+        """Take a connection, waiting for one when all of them are taken."""
+        if not self._slots.acquire(timeout=self.timeout):
+            raise base.Database.OperationalError(
+                f'No pooled connection was freed in {self.timeout} seconds'
+            )
+        try:
+            return super().getconn(key)
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def _putconn(self, conn, key=None, close=False):
+        """Keep every returned connection, not only `minconn` of them."""
+        minconn, self.minconn = self.minconn, self.maxconn
+        try:
+            super()._putconn(conn, key, close)
+        finally:
+            self.minconn = minconn
+
+    def putconn(self, conn=None, key=None, close=False):
+        """Give a connection back and wake up a waiting thread."""
+        try:
+            super().putconn(conn, key, close)
+        finally:
+            self._slots.release()
+
+
+def get_pool(alias, settings, conn_params):
+    """Get the pool of a database alias, creating it in this process."""
+    key = (os.getpid(), alias)
+    with _pools_lock:
+        if key not in _pools:
+            _pools[key] = BlockingConnectionPool(
+                settings['MIN_SIZE'], settings['MAX_SIZE'],
+                settings.get('TIMEOUT'), **conn_params
+            )
+        return _pools[key]
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """PostgreSQL connection reused safely across requests."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.health_check_enabled = self.settings_dict.get(
+            'CONN_HEALTH_CHECKS', False
+        )
+        self.health_check_done = False
+
+    @property
+    def pool(self):
+        """Get the pool of this alias, `None` when pooling is off."""
+        settings = self.settings_dict.get('POOL')
+        if not settings:
+            return None
+        return get_pool(self.alias, settings, self.get_connection_params())
+
+    def get_new_connection(self, conn_params):
+        """Take a connection from the pool or open a new one."""
+        pool = self.pool
+        if pool is None:
+            return super().get_new_connection(conn_params)
+        connection = pool.getconn()
+        if connection.closed or (
+                self.health_check_enabled and not self._ping(connection)):
+            pool.putconn(connection, close=True)
+            connection = pool.getconn()
+        self.configure_connection(connection)
+        return connection
+
+    def configure_connection(self, connection):
+        """
+        Set a pooled connection up like `get_new_connection` of Django does.
+
+        The isolation level is read from, or applied to, the connection
+        before autocommit is turned on, and JSONB is left undecoded for the
+        decoder of `JSONField`.
+        """
+        options = self.settings_dict['OPTIONS']
+        try:
+            self.isolation_level = options['isolation_level']
+        except KeyError:
+            self.isolation_level = connection.isolation_level
+        else:
+            if self.isolation_level != connection.isolation_level:
+                connection.set_session(isolation_level=self.isolation_level)
+        psycopg2.extras.register_default_jsonb(
+            conn_or_curs=connection, loads=lambda value: value
+        )
+
+    @staticmethod
+    def _ping(connection):
+        """Check a pooled connection still reaches the server."""
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+            if not connection.autocommit:
+                connection.rollback()
+        except base.Database.Error:
+            return False
+        return True
+
+    def connect(self):
+        """Connect; a fresh connection needs no health check."""
+        super().connect()
+        self.health_check_done = True
+
+    def _close(self):
+        """Return a pooled connection instead of closing it."""
+        pool = self.pool
+        if pool is None or self.connection is None:
+            return super()._close()
+        with self.wrap_database_errors:
+            pool.putconn(self.connection, close=bool(self.connection.closed))
+
+    def close_if_unusable_or_obsolete(self):
+        """Close an obsolete connection, schedule a check of the rest."""
+        super().close_if_unusable_or_obsolete()
+        self.health_check_done = False
+
+    def close_if_health_check_failed(self):
+        """Close a reused connection the server no longer answers on."""
+        if (self.connection is None or not self.health_check_enabled
+                or self.health_check_done or self.in_atomic_block):
+            return
+        if not self.is_usable():
+            self.close()
+        self.health_check_done = True
+
+    def _cursor(self, name=None):
+        """Check a reused connection before its first query."""
+        self.close_if_health_check_failed()
+        return super()._cursor(name)
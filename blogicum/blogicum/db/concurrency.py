@@ -0,0 +1,108 @@
+"""Helpers for async views on Django 3.2."""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.db import connections
+
+# The async views await at most two queries together.
+QUERY_WORKERS = 2
+
+_request_executor = ContextVar('async_view_executor', default=None)
+
+
+class RequestExecutor(ThreadPoolExecutor):
+    """
+    Worker threads serving the queries of a single request.
+
+    Django keeps connections per thread, so the executor notes the ones its
+    threads have opened and `close_connections()` closes them once the
+    request is over. Pooled connections go back to the pool after every
+    call instead: a request holding one in an idle thread while waiting
+    for another could starve the pool.
+    """
+
+    def __init__(self, max_workers=QUERY_WORKERS):
+        super().__init__(max_workers, thread_name_prefix='async-view-query')
+        self.used_connections = set()
+
+    def track(self, func):
+        """Wrap `func` to release or note the connections it has used."""
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            try:
+                return func(*args, **kwargs)
+            finally:
+                for connection in connections.all():
+                    if connection.connection is None:
+                        continue
+                    if connection.settings_dict.get('POOL'):
+                        connection.close()
+                    else:
+                        self.used_connections.add(connection)
+        return wrapper
+
+    def close_connections(self):
+        """Close the connections the worker threads have opened."""
+        while self.used_connections:
+            connection = self.used_connections.pop()
+            # The worker threads are idle: the request has awaited them all.
+            connection.inc_thread_sharing()
+            try:
+                connection.close()
+            finally:
+                connection.dec_thread_sharing()
+
+
+def run_query(func, *args, **kwargs):
+    """
+    Run `func` on a worker thread of the request and a connection of its own.
+
+    Unlike the default `thread_sensitive` mode, calls do not queue behind
+    each other, so independent queries awaited together run concurrently.
+    Outside an async view `func` runs in the `thread_sensitive` mode.
+    """
+    executor = _request_executor.get()
+    if executor is None:
+        return sync_to_async(func)(*args, **kwargs)
+    return sync_to_async(
+        executor.track(func), thread_sensitive=False, executor=executor
+    )(*args, **kwargs)
+
+
+class AsyncViewMixin:
+    """
+    Mixin for class-based views with `async def` handlers.
+
+    Django 3.2 only treats coroutine functions as async views, so the view
+    function is wrapped in one; handlers that stay sync, such as
+    `options()`, keep working. Each request gets a `RequestExecutor`, whose
+    connections are closed when the response is ready.
+    """
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        """Get a coroutine function view."""
+        view = super().as_view(**initkwargs)
+
+        @wraps(view)
+        async def async_view(request, *args, **kwargs):
+            executor = RequestExecutor()
+            token = _request_executor.set(executor)
+            try:
+                response = view(request, *args, **kwargs)
+                if asyncio.iscoroutine(response):
+                    response = await response
+            finally:
+                _request_executor.reset(token)
+                try:
+                    await sync_to_async(
+                        executor.close_connections,
+                        thread_sensitive=False, executor=executor
+                    )()
+                finally:
+                    executor.shutdown(wait=False)
+            return response
+        return async_view
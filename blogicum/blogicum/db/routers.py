@@ -0,0 +1,113 @@
+"""
+Routing of read queries to database replicas.
+
+Reads go to a replica only inside a safe request picked by
+`replica_routing_middleware`. Management commands, shells and everything
+else outside a request keep reading from the primary. Unsafe requests
+read from the primary too, and they set a cookie that keeps the client's
+reads on the primary while the replicas catch up with its write. Other
+clients learn about a write from the cache version stamps it bumps and
+call `read_from_primary_after()`, so that what they cache under the new
+version is not read from a replica that has not replayed the write yet.
+"""
+import asyncio
+import random
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+
+PRIMARY_DATABASE = 'default'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+_read_database = ContextVar('read_database', default=None)
+
+
+def get_replicas():
+    """Get the aliases of the configured read replicas."""
+    return getattr(settings, 'DATABASE_REPLICAS', ())
+
+
+class ReplicaRouter:
+    """Send reads of the current request to its replica."""
+
+    def db_for_read(self, model, **hints):
+        """Read from the replica picked for the request, if any."""
+        return _read_database.get() or PRIMARY_DATABASE
+
+    def db_for_write(self, model, **hints):
+        """Write to the primary only."""
+        return PRIMARY_DATABASE
+
+    def allow_relation(self, obj1, obj2, **hints):
+        """Relate objects loaded from the primary or any replica."""
+        databases = {PRIMARY_DATABASE, *get_replicas()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        """Replicas get their schema from the primary."""
+        if db in get_replicas():
+            return False
+        return None
+
+
+def _pick_database(request):
+    """Pick a replica for a request, `None` meaning the primary."""
+    replicas = get_replicas()
+    if (not replicas or request.method not in SAFE_METHODS
+            or settings.REPLICA_STICKY_COOKIE in request.COOKIES):
+        return None
+    return random.choice(replicas)
+
+
+def read_from_primary_after(written_at) -> bool:
+    """
+    Move the reads of the request to the primary after a recent write.
+
+    `written_at` is a Unix timestamp; a write younger than
+    `REPLICA_STICKY_SECONDS` may not have reached the replicas yet.
+    Return whether the reads had to be moved.
+    """
+    if (_read_database.get() is None
+            or time.time() - written_at >= settings.REPLICA_STICKY_SECONDS):
+        return False
+    _read_database.set(None)
+    return True
+
+
+def _stick_to_primary(request, response):
+    """Keep a client that has just written on the primary for a while."""
+    if request.method not in SAFE_METHODS and get_replicas():
+        response.set_cookie(
+            settings.REPLICA_STICKY_COOKIE, '1',
+            max_age=settings.REPLICA_STICKY_SECONDS,
+            httponly=True, samesite='Lax'
+        )
+    return response
+
+
+def replica_routing_middleware(get_response):
+    """Route the reads of each request to the primary or to a replica."""
+    if asyncio.iscoroutinefunction(get_response):
+        async def middleware(request):
+            token = _read_database.set(_pick_database(request))
+            try:
+                response = await get_response(request)
+            finally:
+                _read_database.reset(token)
+            return _stick_to_primary(request, response)
+    else:
+        def middleware(request):
+            token = _read_database.set(_pick_database(request))
+            try:
+                response = get_response(request)
+            finally:
+                _read_database.reset(token)
+            return _stick_to_primary(request, response)
+    return middleware
+
+
+replica_routing_middleware.sync_capable = True
+replica_routing_middleware.async_capable = True
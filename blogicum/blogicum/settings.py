@@ -56,7 +56,7 @@ MIDDLEWARE = [
     'debug_toolbar.middleware.DebugToolbarMiddleware',
 ]
 
-ROOT_URLCONF = 'blogicum.urls'
+ROOT_URLCONF = os.getenv('DJANGO_ROOT_URLCONF', 'blogicum.urls')
 
 TEMPLATES_DIR = BASE_DIR / 'templates'
 
@@ -90,6 +90,20 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/3.2/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'pages': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'pages',
+    },
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/3.2/ref/settings/#auth-password-validators
 
@@ -147,6 +161,7 @@ LOGIN_URL = 'login'
 CSRF_FAILURE_VIEW = 'pages.views.csrf_failure'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
+SITEMAP_ROOT = BASE_DIR / 'sitemaps'
 
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
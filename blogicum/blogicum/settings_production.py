@@ -0,0 +1,71 @@
+"""
+Production settings for blogicum project.
+
+Everything deployment-specific comes from environment variables; select
+this module with DJANGO_SETTINGS_MODULE=blogicum.settings_production for
+both `wsgi.py` and `asgi.py`.
+"""
+import os
+
+from blogicum.caches import caches_from_env
+from blogicum.db import (
+    database_from_env, env_bool, env_int, replicas_from_env
+)
+from blogicum.settings import *  # noqa: F401,F403
+from blogicum.settings import (
+    BASE_DIR, CACHES, INSTALLED_APPS, MIDDLEWARE, TEMPLATES
+)
+
+SECRET_KEY = os.environ['DJANGO_SECRET_KEY']
+
+DEBUG = env_bool('DJANGO_DEBUG')
+
+ALLOWED_HOSTS = os.getenv('DJANGO_ALLOWED_HOSTS', 'localhost').split(',')
+
+if not DEBUG:
+    # Templates are compiled once per worker, see `blogicum.warmup`.
+    TEMPLATES = [{
+        **TEMPLATES[0],
+        'APP_DIRS': False,
+        'OPTIONS': {
+            **TEMPLATES[0]['OPTIONS'],
+            'loaders': [(
+                'django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]
+            )],
+        },
+    }]
+
+INSTALLED_APPS = [app for app in INSTALLED_APPS if app != 'debug_toolbar']
+
+MIDDLEWARE = [
+    middleware for middleware in MIDDLEWARE
+    if not middleware.startswith('debug_toolbar.')
+]
+MIDDLEWARE.insert(
+    MIDDLEWARE.index('django.middleware.security.SecurityMiddleware') + 1,
+    'blogicum.db.routers.replica_routing_middleware'
+)
+
+DATABASES = {
+    'default': database_from_env('DB', {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'db.sqlite3',
+    }),
+}
+
+replicas = replicas_from_env(DATABASES['default'], 'DB')
+DATABASES.update(replicas)
+DATABASE_REPLICAS = list(replicas)
+DATABASE_ROUTERS = ['blogicum.db.routers.ReplicaRouter']
+# Reads of a client stay on the primary for this long after it writes.
+REPLICA_STICKY_COOKIE = 'use_primary'
+REPLICA_STICKY_SECONDS = env_int('DB_REPLICA_STICKY_SECONDS', 10)
+
+CACHES = caches_from_env('CACHE', CACHES)
+
+STATICFILES_DIRS = []
+STATIC_ROOT = os.getenv('DJANGO_STATIC_ROOT', BASE_DIR / 'static')
+SITEMAP_ROOT = os.getenv('DJANGO_SITEMAP_ROOT', BASE_DIR / 'sitemaps')
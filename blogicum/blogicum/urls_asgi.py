@@ -0,0 +1,29 @@
+"""
+Blogicum URL Configuration of the ASGI entry point.
+
+Same routes as `blogicum.urls`, with the read-only blog and static pages
+served by async views.
+"""
+from django.urls import include, path
+
+from blogicum import urls
+from blogicum.urls import handler403, handler404, handler500  # noqa: F401
+
+ASYNC_URLCONFS = {
+    'blog': 'blog.urls_async',
+    'pages': 'pages.urls_async',
+}
+
+
+def use_async_views(pattern):
+    """Swap an included app for its async URLconf."""
+    namespace = getattr(pattern, 'namespace', None)
+    if namespace not in ASYNC_URLCONFS:
+        return pattern
+    return path(
+        str(pattern.pattern),
+        include(ASYNC_URLCONFS[namespace], namespace=namespace)
+    )
+
+
+urlpatterns = [use_async_views(pattern) for pattern in urls.urlpatterns]
@@ -0,0 +1,45 @@
+"""Compiling templates before a worker serves its first request."""
+import os
+
+from django.template import TemplateDoesNotExist, TemplateSyntaxError, engines
+from django.template.backends.django import DjangoTemplates
+from django.template.loaders.cached import Loader as CachedLoader
+
+
+def iter_template_names(loader):
+    """Yield the names of the templates a loader can find."""
+    for directory in loader.get_dirs():
+        directory = str(directory)
+        for root, _, files in os.walk(directory):
+            for filename in files:
+                path = os.path.join(root, filename)
+                yield os.path.relpath(path, directory).replace(os.sep, '/')
+
+
+def warm_up_templates() -> int:
+    """
+    Fill the cached template loaders with every template they can find.
+
+    Returns how many templates were compiled; nothing is done for engines
+    without a cached loader, as their templates would not be kept anyway.
+    """
+    compiled = 0
+    for backend in engines.all():
+        if not isinstance(backend, DjangoTemplates):
+            continue
+        engine = backend.engine
+        for cached_loader in engine.template_loaders:
+            if not isinstance(cached_loader, CachedLoader):
+                continue
+            names = {
+                name for loader in cached_loader.loaders
+                for name in iter_template_names(loader)
+            }
+            for name in sorted(names):
+                try:
+                    engine.get_template(name)
+                except (TemplateDoesNotExist, TemplateSyntaxError,
+                        UnicodeDecodeError):
+                    continue
+                compiled += 1
+    return compiled
@@ -1,6 +1,9 @@
 from http import HTTPStatus
 
 from django.shortcuts import render
+from django.views.generic import TemplateView
+
+from blogicum.db.concurrency import AsyncViewMixin, run_query
 
 
 def page_not_found(request, exception):
@@ -20,3 +23,12 @@ def server_error(request, reason=''):
                   'pages/500.html',
                   status=HTTPStatus.INTERNAL_SERVER_ERROR
                   )
+
+
+class AsyncTemplateView(AsyncViewMixin, TemplateView):
+    """Static page served from an async handler."""
+
+    async def get(self, request, *args, **kwargs):
+        response = super().get(request, *args, **kwargs)
+        await run_query(response.render)
+        return response
@@ -0,0 +1,36 @@
+import os
+
+import psycopg2
+import pytest
+
+
+@pytest.fixture
+def postgres_settings(django_db_blocker):
+    """Settings of a reachable PostgreSQL server, configured by `PG*`."""
+    params = {
+        "NAME": os.getenv("PGDATABASE", "postgres"),
+        "USER": os.getenv("PGUSER", "postgres"),
+        "PASSWORD": os.getenv("PGPASSWORD", ""),
+        "HOST": os.getenv("PGHOST", "localhost"),
+        "PORT": os.getenv("PGPORT", "5432"),
+    }
+    try:
+        psycopg2.connect(
+            dbname=params["NAME"], user=params["USER"],
+            password=params["PASSWORD"], host=params["HOST"],
+            port=params["PORT"], connect_timeout=2,
+        ).close()
+    except psycopg2.OperationalError:
+        pytest.skip("PostgreSQL недоступен.")
+    with django_db_blocker.unblock():
+        yield {
+            "ENGINE": "blogicum.db",
+            **params,
+            "OPTIONS": {},
+            "TIME_ZONE": None,
+            "CONN_MAX_AGE": 0,
+            "CONN_HEALTH_CHECKS": True,
+            "AUTOCOMMIT": True,
+            "ATOMIC_REQUESTS": False,
+            "TEST": {},
+        }
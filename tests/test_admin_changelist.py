@@ -0,0 +1,72 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+pytestmark = [pytest.mark.django_db]
+
+CHANGELISTS = ("/admin/blog/post/", "/admin/blog/comment/")
+
+
+@pytest.fixture
+def admin_client(mixer):
+    admin = mixer.blend("auth.User", is_staff=True, is_superuser=True)
+    client = Client()
+    client.force_login(admin)
+    return client
+
+
+@pytest.fixture
+def grow(mixer, published_category, published_locations):
+    def grow(n):
+        authors = mixer.cycle(n).blend("auth.User")
+        posts = mixer.cycle(n).blend(
+            "blog.Post",
+            author=mixer.sequence(*authors),
+            category=published_category,
+            location=mixer.sequence(*published_locations),
+            pub_date=(timezone.now() - timedelta(days=i) for i in range(n)),
+        )
+        mixer.cycle(n).blend(
+            "blog.Comment",
+            post=mixer.sequence(*posts),
+            author=mixer.sequence(*authors),
+        )
+
+    return grow
+
+
+def count_queries(client, url):
+    cache.clear()
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url)
+    assert response.status_code == HTTPStatus.OK, (
+        f"Убедитесь, что страница `{url}` загружается без ошибок."
+    )
+    return len(queries)
+
+
+@pytest.mark.parametrize("url", CHANGELISTS)
+def test_changelist_query_count_is_constant(admin_client, grow, url):
+    grow(3)
+    small = count_queries(admin_client, url)
+    grow(30)
+    large = count_queries(admin_client, url)
+    assert small == large, (
+        f"Убедитесь, что число запросов на странице `{url}` не зависит от"
+        f" числа строк: было {small}, стало {large}."
+    )
+
+
+def test_post_changelist_filters_by_date(admin_client, grow):
+    grow(3)
+    year = timezone.now().year
+    response = admin_client.get(f"/admin/blog/post/?pub_date__year={year}")
+    assert response.status_code == HTTPStatus.OK, (
+        "Убедитесь, что список публикаций можно фильтровать по дате."
+    )
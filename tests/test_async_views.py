@@ -0,0 +1,113 @@
+from http import HTTPStatus
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.cache import caches
+from django.db import connections
+from django.test import AsyncClient, Client, override_settings
+
+from blogicum.db.concurrency import RequestExecutor
+
+pytestmark = [
+    pytest.mark.django_db(transaction=True),
+    pytest.mark.usefixtures("asgi_urlconf"),
+]
+
+
+@async_to_sync
+async def fetch(client, url, **extra):
+    return await client.get(url, **extra)
+
+
+@pytest.fixture
+def asgi_urlconf():
+    with override_settings(ROOT_URLCONF="blogicum.urls_asgi"):
+        yield
+
+
+@pytest.fixture
+def page_urls(user, post_with_published_location, comment):
+    post = post_with_published_location
+    return [
+        "/",
+        "/?page=1",
+        f"/posts/{post.id}/",
+        f"/posts/{post.id}/comments/",
+        f"/category/{post.category.slug}/",
+        f"/profile/{user.username}/",
+        "/pages/about/",
+        "/pages/rules/",
+    ]
+
+
+def test_async_pages_match_sync_pages(page_urls, user):
+    async_client = AsyncClient()
+    sync_client = Client()
+    for url in page_urls:
+        response = fetch(async_client, url)
+        assert response.status_code == HTTPStatus.OK, (
+            f"Убедитесь, что асинхронная страница `{url}` загружается без"
+            " ошибок."
+        )
+        caches["pages"].clear()
+        with override_settings(ROOT_URLCONF="blogicum.urls"):
+            expected = sync_client.get(url)
+        assert response.content == expected.content, (
+            f"Убедитесь, что асинхронная страница `{url}` совпадает с"
+            " синхронной."
+        )
+    etag = fetch(async_client, "/")["ETag"]
+    response = fetch(async_client, "/", **{"If-None-Match": etag})
+    assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+        "Убедитесь, что асинхронная лента отвечает 304 на неизменившуюся"
+        " страницу."
+    )
+
+
+def test_async_pages_not_found(post_with_published_location):
+    post = post_with_published_location
+    client = AsyncClient()
+    for url in (
+            "/posts/0/",
+            "/category/no-such-category/",
+            "/profile/no-such-user/",
+            "/?page=100",
+    ):
+        response = fetch(client, url)
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            f"Убедитесь, что асинхронная страница `{url}` отвечает 404."
+        )
+    post.is_published = False
+    post.save()
+    response = fetch(client, f"/posts/{post.id}/")
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+def test_worker_connections_closed_after_request(monkeypatch, page_urls):
+    used, closed, opened = [], [], []
+    close_connections = RequestExecutor.close_connections
+    close = type(connections["default"]).close
+
+    def spy_close_connections(executor):
+        used.extend(executor.used_connections)
+        opened.extend(executor.used_connections)
+        close_connections(executor)
+
+    def spy_close(wrapper):
+        closed.append(wrapper)
+        close(wrapper)
+
+    monkeypatch.setattr(
+        RequestExecutor, "close_connections", spy_close_connections
+    )
+    monkeypatch.setattr(type(connections["default"]), "close", spy_close)
+    client = AsyncClient()
+    for url in page_urls:
+        fetch(client, url)
+        assert set(used) <= set(closed), (
+            f"Убедитесь, что после запроса `{url}` соединения рабочих"
+            " потоков закрываются, а не ждут следующего запроса."
+        )
+        used.clear()
+        closed.clear()
+    assert opened, "Убедитесь, что асинхронные страницы работают с базой."
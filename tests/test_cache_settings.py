@@ -0,0 +1,32 @@
+from django.core.checks import run_checks
+from django.test import override_settings
+
+from blogicum.caches import caches_from_env
+
+LOCMEM = "django.core.cache.backends.locmem.LocMemCache"
+
+
+def test_caches_from_env(monkeypatch):
+    monkeypatch.setenv("CACHE_BACKEND", "memcached")
+    monkeypatch.setenv("CACHE_LOCATION", "127.0.0.1:11211")
+    caches = caches_from_env("CACHE")
+    assert {config["BACKEND"] for config in caches.values()} == {
+        "django.core.cache.backends.memcached.PyMemcacheCache"
+    }, "Убедитесь, что `memcached` выбирает бэкенд PyMemcacheCache."
+    assert caches["default"]["KEY_PREFIX"] != caches["pages"]["KEY_PREFIX"]
+
+
+def test_local_memory_cache_warns_in_production():
+    caches = caches_from_env("CACHE", {"default": {"BACKEND": LOCMEM}})
+    with override_settings(DEBUG=False, CACHES=caches):
+        warnings = [
+            message.id for message in run_checks(tags=["caches"])
+        ]
+    assert "blogicum.W001" in warnings, (
+        "Убедитесь, что проверка системы предупреждает о кеше в памяти"
+        " процесса в продакшене."
+    )
+    with override_settings(DEBUG=True, CACHES=caches):
+        assert not run_checks(tags=["caches"]), (
+            "Убедитесь, что при отладке кеш в памяти процесса допустим."
+        )
@@ -0,0 +1,62 @@
+import pytest
+from django.core.management import call_command
+
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_comment_count_follows_comments(mixer, post_with_published_location):
+    post = post_with_published_location
+    comments = mixer.cycle(3).blend("blog.Comment", post=post)
+    post.refresh_from_db()
+    assert post.comment_count == 3, (
+        "Убедитесь, что счётчик комментариев увеличивается при добавлении"
+        " комментария."
+    )
+
+    comments[0].delete()
+    post.refresh_from_db()
+    assert post.comment_count == 2, (
+        "Убедитесь, что счётчик комментариев уменьшается при удалении"
+        " комментария."
+    )
+
+
+def test_comment_count_follows_moved_comment(
+        mixer, post_with_published_location
+):
+    post = post_with_published_location
+    other_post = mixer.blend(
+        "blog.Post", author=post.author, category=post.category
+    )
+    comment = mixer.blend("blog.Comment", post=post)
+    comment.post = other_post
+    comment.save()
+    post.refresh_from_db()
+    other_post.refresh_from_db()
+    assert (post.comment_count, other_post.comment_count) == (0, 1), (
+        "Убедитесь, что при переносе комментария в другую публикацию"
+        " счётчики обеих публикаций обновляются."
+    )
+
+    comment.text = "Исправленный текст"
+    comment.save()
+    other_post.refresh_from_db()
+    assert other_post.comment_count == 1, (
+        "Убедитесь, что редактирование комментария не меняет счётчик."
+    )
+
+
+def test_reconcile_comment_counts(mixer, post_with_published_location):
+    post = post_with_published_location
+    mixer.cycle(2).blend("blog.Comment", post=post)
+    Post.objects.filter(pk=post.pk).update(comment_count=10)
+
+    call_command("reconcile_comment_counts", batch_size=1)
+
+    post.refresh_from_db()
+    assert post.comment_count == 2, (
+        "Убедитесь, что команда `reconcile_comment_counts` исправляет"
+        " рассинхронизированные счётчики комментариев."
+    )
@@ -0,0 +1,49 @@
+from http import HTTPStatus
+
+import pytest
+
+from conftest import N_PER_PAGE
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_comment_pages(mixer, user_client, post_with_published_location):
+    from blog.constants import Config
+
+    post = post_with_published_location
+    comments = mixer.cycle(Config.COMMENTS_PER_PAGE + N_PER_PAGE).blend(
+        "blog.Comment", post=post
+    )
+    response = user_client.get(f"/posts/{post.id}/")
+    first_page = response.context["comments"]
+    assert len(first_page) == Config.COMMENTS_PER_PAGE, (
+        "Убедитесь, что на странице публикации комментарии выводятся"
+        " порциями."
+    )
+    assert first_page.has_next()
+
+    response = user_client.get(
+        f"/posts/{post.id}/comments/?cursor={first_page.next_cursor}"
+    )
+    assert response.status_code == HTTPStatus.OK
+    next_page = response.context["comments"]
+    assert [c.id for c in first_page] + [c.id for c in next_page] == [
+        c.id for c in comments
+    ], (
+        "Убедитесь, что следующая порция комментариев продолжает предыдущую."
+    )
+    assert not next_page.has_next()
+    assert "<html" not in response.content.decode("utf-8"), (
+        "Убедитесь, что следующая порция комментариев отдаётся фрагментом"
+        " без обрамления страницы."
+    )
+
+
+def test_comment_fragment_hides_unpublished_post(
+        mixer, another_user_client, post_with_published_location
+):
+    post = post_with_published_location
+    post.is_published = False
+    post.save()
+    response = another_user_client.get(f"/posts/{post.id}/comments/")
+    assert response.status_code == HTTPStatus.NOT_FOUND
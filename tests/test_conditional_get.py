@@ -0,0 +1,70 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog.models import Comment
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def page_urls(user, post_with_published_location):
+    post = post_with_published_location
+    return [
+        "/",
+        f"/posts/{post.id}/",
+        f"/category/{post.category.slug}/",
+        f"/profile/{user.username}/",
+    ]
+
+
+@pytest.mark.parametrize("client_name", ["user_client", "unlogged_client"])
+def test_unchanged_pages_not_modified(request, client_name, page_urls):
+    client = request.getfixturevalue(client_name)
+    for url in page_urls:
+        etag = client.get(url)["ETag"]
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            f"Убедитесь, что неизменившаяся страница `{url}` отдаётся со"
+            " статусом 304."
+        )
+        assert len(queries) <= 3, (
+            f"Убедитесь, что ответ 304 на странице `{url}` не выполняет"
+            " основных запросов страницы."
+        )
+
+
+def test_changed_page_rendered_again(
+        user_client, post_with_published_location
+):
+    post = post_with_published_location
+    url = f"/posts/{post.id}/"
+    etag = user_client.get(url)["ETag"]
+    post.title = "Новый заголовок"
+    post.save()
+    response = user_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK, (
+        "Убедитесь, что изменившаяся страница публикации отдаётся заново."
+    )
+
+
+def test_edited_comment_renders_page_again(
+        user, user_client, post_with_published_location
+):
+    post = post_with_published_location
+    comment = Comment.objects.create(post=post, author=user, text="Было")
+    url = f"/posts/{post.id}/"
+    etag = user_client.get(url)["ETag"]
+    comment.text = "Стало"
+    comment.save()
+    response = user_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK, (
+        "Убедитесь, что после редактирования комментария страница публикации"
+        " отдаётся заново."
+    )
+    assert "Стало" in response.content.decode(), (
+        "Убедитесь, что на странице публикации виден изменённый комментарий."
+    )
@@ -0,0 +1,101 @@
+import threading
+import time
+
+import pytest
+from django.db import OperationalError
+
+from blogicum.db.base import DatabaseWrapper, _pools
+
+
+@pytest.fixture
+def make_wrapper(postgres_settings):
+    wrappers = []
+
+    def make(alias, max_size=1, timeout=5, **options):
+        wrapper = DatabaseWrapper({
+            **postgres_settings,
+            "OPTIONS": options,
+            "POOL": {"MIN_SIZE": 0, "MAX_SIZE": max_size,
+                     "TIMEOUT": timeout},
+        }, alias)
+        wrappers.append(wrapper)
+        return wrapper
+
+    yield make
+    for wrapper in wrappers:
+        if wrapper.connection is not None:
+            wrapper.close()
+    for pool in _pools.values():
+        pool.closeall()
+    _pools.clear()
+
+
+def backend_pid(wrapper):
+    with wrapper.cursor() as cursor:
+        cursor.execute("SELECT pg_backend_pid()")
+        return cursor.fetchone()[0]
+
+
+def test_pooled_connection_is_reused(make_wrapper):
+    first = make_wrapper("pool_reuse")
+    pid = backend_pid(first)
+    first.close()
+    second = make_wrapper("pool_reuse")
+    assert backend_pid(second) == pid, (
+        "Убедитесь, что закрытое соединение возвращается в пул и"
+        " переиспользуется."
+    )
+
+
+def test_pooled_connection_is_set_up_like_a_new_one(make_wrapper):
+    first = make_wrapper("pool_setup", isolation_level=3)
+    backend_pid(first)
+    first.close()
+    wrapper = make_wrapper("pool_setup", isolation_level=3)
+    wrapper.set_autocommit(False)
+    with wrapper.cursor() as cursor:
+        cursor.execute("""SELECT '{"a": 1}'::jsonb""")
+        value = cursor.fetchone()[0]
+        cursor.execute("SHOW transaction_isolation")
+        isolation = cursor.fetchone()[0]
+    wrapper.rollback()
+    wrapper.set_autocommit(True)
+    assert wrapper.isolation_level == 3
+    assert isinstance(value, str), (
+        "Убедитесь, что у соединений из пула JSONB не декодируется, как у"
+        " новых соединений Django."
+    )
+    assert isolation == "serializable", (
+        "Убедитесь, что соединения из пула получают уровень изоляции из"
+        " `OPTIONS`."
+    )
+
+
+def test_exhausted_pool_waits_for_a_connection(make_wrapper):
+    holder = make_wrapper("pool_wait")
+    backend_pid(holder)
+    result = {}
+
+    def wait():
+        waiter = make_wrapper("pool_wait")
+        result["pid"] = backend_pid(waiter)
+        waiter.close()
+
+    thread = threading.Thread(target=wait)
+    thread.start()
+    time.sleep(0.3)
+    assert thread.is_alive(), (
+        "Убедитесь, что при исчерпании пула запрос ждёт соединение."
+    )
+    holder.close()
+    thread.join(5)
+    assert "pid" in result, (
+        "Убедитесь, что ожидающий запрос получает освобождённое соединение."
+    )
+
+
+def test_exhausted_pool_times_out(make_wrapper):
+    holder = make_wrapper("pool_timeout", timeout=0.2)
+    backend_pid(holder)
+    with pytest.raises(OperationalError):
+        backend_pid(make_wrapper("pool_timeout", timeout=0.2))
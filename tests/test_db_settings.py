@@ -0,0 +1,47 @@
+import pytest
+
+from blogicum.db import database_from_env
+
+SQLITE = {"ENGINE": "django.db.backends.sqlite3", "NAME": "db.sqlite3"}
+
+
+@pytest.fixture
+def db_env(monkeypatch):
+    for name in ("DB_CONN_MAX_AGE", "DB_POOL_MAX_SIZE",
+                 "DB_CONN_HEALTH_CHECKS"):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setenv("DB_ENGINE", "postgresql")
+    monkeypatch.setenv("DB_NAME", "blog")
+    return monkeypatch
+
+
+def test_default_database_without_engine(monkeypatch):
+    monkeypatch.delenv("DB_ENGINE", raising=False)
+    assert database_from_env("DB", SQLITE) == SQLITE, (
+        "Убедитесь, что без `DB_ENGINE` используется база по умолчанию."
+    )
+
+
+def test_postgresql_keeps_connections(db_env):
+    database = database_from_env("DB", SQLITE)
+    assert database["ENGINE"] == "blogicum.db"
+    assert database["NAME"] == "blog"
+    assert database["CONN_MAX_AGE"] == 60, (
+        "Убедитесь, что соединения с PostgreSQL по умолчанию переиспользуются."
+    )
+    assert database["CONN_HEALTH_CHECKS"] is True
+    assert not database["POOL"]
+
+
+def test_postgresql_pool_and_unlimited_age(db_env):
+    db_env.setenv("DB_CONN_MAX_AGE", "none")
+    db_env.setenv("DB_POOL_MAX_SIZE", "8")
+    db_env.setenv("DB_CONN_HEALTH_CHECKS", "off")
+    database = database_from_env("DB", SQLITE)
+    assert database["CONN_MAX_AGE"] is None
+    assert database["CONN_HEALTH_CHECKS"] is False
+    assert database["POOL"] == {
+        "MIN_SIZE": 1, "MAX_SIZE": 8, "TIMEOUT": 10
+    }, (
+        "Убедитесь, что `DB_POOL_MAX_SIZE` включает пул соединений."
+    )
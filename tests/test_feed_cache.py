@@ -0,0 +1,30 @@
+import time
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_scheduled_post_appears_on_time(
+        mixer, user, user_client, published_category
+):
+    mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, pub_date=timezone.now() - timedelta(days=1),
+    )
+    scheduled = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, pub_date=timezone.now() + timedelta(seconds=1),
+    )
+    response = user_client.get("/")
+    assert scheduled not in response.context["page_obj"]
+    assert len(user_client.get("/").context["page_obj"]) == 1
+
+    time.sleep(1.5)
+    response = user_client.get("/")
+    assert scheduled in response.context["page_obj"], (
+        "Убедитесь, что отложенная публикация появляется на главной странице,"
+        " как только наступает время её публикации."
+    )
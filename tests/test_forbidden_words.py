@@ -0,0 +1,36 @@
+import difflib
+import random
+
+import pytest
+from django.core.exceptions import ValidationError
+
+from blog.validators import ForbiddenWordsMatcher, forbidden_words
+
+
+def test_matcher_agrees_with_difflib():
+    rnd = random.Random(0)
+    alphabet = "абвгдеёжзийклмнопрстуфхцчшщъыьэюя"
+
+    def word():
+        return "".join(
+            rnd.choice(alphabet) for _ in range(rnd.randint(1, 12))
+        )
+
+    forbidden = {word() for _ in range(300)}
+    tokens = {word() for _ in range(300)}
+    expected = {
+        item for item in forbidden
+        if difflib.get_close_matches(item, tokens, n=1, cutoff=0.6)
+    }
+    assert ForbiddenWordsMatcher(forbidden).find(tokens) == expected, (
+        "Убедитесь, что проверка запрещённых слов находит те же совпадения,"
+        " что и `difflib.get_close_matches`."
+    )
+
+
+@pytest.mark.django_db
+def test_forbidden_words_follow_word_list(mixer):
+    forbidden_words("Безобидный текст")
+    mixer.blend("blog.ForbiddenWord", word="Запрет")
+    with pytest.raises(ValidationError):
+        forbidden_words("Здесь есть запреты")
@@ -0,0 +1,57 @@
+import pytest
+from django.db import connection
+
+from blog.models import Comment, Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def query_plan():
+    if connection.vendor not in ("sqlite", "postgresql"):
+        pytest.skip("Планы запросов проверяются только для SQLite и PostgreSQL")
+
+    def explain(queryset):
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("SET LOCAL enable_seqscan = off")
+        return queryset.explain()
+
+    return explain
+
+
+@pytest.mark.parametrize(
+    ("get_queryset", "index_name"),
+    [
+        (lambda c, u, p: Post.objects.published().card_columns()[:10],
+         "post_visible_feed_idx"),
+        (lambda c, u, p: (
+            Post.objects.published().for_category(c).card_columns()[:10]
+        ), "post_category_feed_idx"),
+        (lambda c, u, p: Post.objects.by_author(u).card_columns()[:10],
+         "post_author_feed_idx"),
+        (lambda c, u, p: Comment.objects.filter(post=p),
+         "comment_post_created_idx"),
+    ],
+    ids=["published feed", "category feed", "profile feed", "comments"],
+)
+def test_feed_queries_use_indexes(
+        query_plan, get_queryset, index_name, user, published_category,
+        post_with_published_location
+):
+    plan = query_plan(
+        get_queryset(published_category, user, post_with_published_location)
+    )
+    assert index_name in plan, (
+        f"Убедитесь, что запрос использует индекс `{index_name}`. План"
+        f" запроса:\n{plan}"
+    )
+
+
+def test_all_posts_of_category_use_index(query_plan, published_category):
+    plan = query_plan(Post.objects.filter(category=published_category))
+    assert "blog_post_category_id" in plan, (
+        "Убедитесь, что выборка всех публикаций категории, включая"
+        " неопубликованные (например, при удалении категории), использует"
+        f" индекс по `category_id`. План запроса:\n{plan}"
+    )
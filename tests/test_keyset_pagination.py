@@ -0,0 +1,85 @@
+import json
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.utils import timezone
+from django.utils.http import urlsafe_base64_encode
+from mixer.backend.django import Mixer
+
+from blog.views import PostListView
+from conftest import N_PER_PAGE
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def keyset_feed(monkeypatch):
+    monkeypatch.setattr(PostListView, "keyset_pagination", True)
+
+
+@pytest.fixture
+def posts_with_same_pub_date(mixer: Mixer, user, published_category):
+    pub_date = timezone.now() - timedelta(days=1)
+    return mixer.cycle(N_PER_PAGE * 2 + 5).blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        pub_date=pub_date,
+        is_published=True,
+    )
+
+
+def test_keyset_pages_cover_feed(
+        keyset_feed, user_client, many_posts_with_published_locations,
+        posts_with_same_pub_date
+):
+    expected_ids = [
+        post.id for post in sorted(
+            many_posts_with_published_locations + posts_with_same_pub_date,
+            key=lambda post: (post.pub_date, post.id),
+            reverse=True,
+        )
+    ]
+    seen_ids, cursors, url = [], [], "/"
+    while url:
+        response = user_client.get(url)
+        assert response.status_code == HTTPStatus.OK, (
+            "Убедитесь, что страницы ленты по курсору загружаются без ошибок."
+        )
+        page = response.context["page_obj"]
+        assert len(page) <= N_PER_PAGE
+        seen_ids.extend(post.id for post in page)
+        cursors.append(page.previous_cursor)
+        url = f"/?cursor={page.next_cursor}" if page.has_next() else None
+    assert seen_ids == expected_ids, (
+        "Убедитесь, что при постраничном выводе по курсору публикации не"
+        " пропускаются и не повторяются."
+    )
+
+    response = user_client.get(f"/?cursor={cursors[-1]}")
+    previous_ids = [post.id for post in response.context["page_obj"]]
+    assert previous_ids == expected_ids[-N_PER_PAGE - 5:-5], (
+        "Убедитесь, что ссылка на предыдущую страницу ведёт на неё."
+    )
+
+
+def test_keyset_bad_cursor(user_client):
+    response = user_client.get("/?cursor=not-a-cursor")
+    assert response.status_code == HTTPStatus.NOT_FOUND, (
+        "Убедитесь, что при неверном курсоре возвращается статус 404."
+    )
+
+
+@pytest.mark.parametrize("forged_id", [[1], {"id": 1}, "abc", None])
+def test_keyset_forged_cursor(
+        user_client, post_with_published_location, forged_id
+):
+    payload = json.dumps(["n", [timezone.now().isoformat(), forged_id]])
+    cursor = urlsafe_base64_encode(payload.encode())
+    for url in ("/", f"/posts/{post_with_published_location.id}/"):
+        response = user_client.get(f"{url}?cursor={cursor}")
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            f"Убедитесь, что на странице `{url}` курсор с подделанными"
+            " значениями даёт статус 404."
+        )
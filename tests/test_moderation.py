@@ -0,0 +1,119 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blog.models import Comment, Post
+from blog.moderation import delete_posts
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def make_posts(mixer, user, published_category):
+    def make(n, **kwargs):
+        posts = mixer.cycle(n).blend(
+            "blog.Post",
+            **{
+                "author": user,
+                "category": published_category,
+                "is_published": True,
+                "pub_date": timezone.now() - timedelta(hours=1),
+                **kwargs,
+            },
+        )
+        mixer.cycle(n * 2).blend(
+            "blog.Comment", post=mixer.sequence(*posts), author=user
+        )
+        return posts
+
+    return make
+
+
+def test_publish_and_unpublish_refresh_feed(client, make_posts):
+    posts = make_posts(3, is_published=False)
+    assert not list(client.get("/").context["page_obj"])
+    call_command("moderate_posts", "publish", "--all", "--batch-size", "2")
+    assert len(client.get("/").context["page_obj"]) == 3, (
+        "Убедитесь, что после массовой публикации лента обновляется."
+    )
+    call_command("moderate_posts", "unpublish", "--ids", str(posts[0].id))
+    assert len(client.get("/").context["page_obj"]) == 2, (
+        "Убедитесь, что после массового снятия с публикации лента"
+        " обновляется."
+    )
+
+
+def test_move_updates_category_and_search(
+        client, mixer, make_posts, published_category
+):
+    posts = make_posts(3)
+    target = mixer.blend(
+        "blog.Category", is_published=True, title="Архипелаг"
+    )
+    call_command(
+        "moderate_posts", "move",
+        "--category", published_category.slug,
+        "--to-category", target.slug,
+    )
+    assert set(target.posts.all()) == set(posts), (
+        "Убедитесь, что публикации переносятся в указанную категорию."
+    )
+    found = client.get("/search/", {"q": "архипелаг"}).context["page_obj"]
+    assert set(found) == set(posts), (
+        "Убедитесь, что после переноса обновляется поисковый индекс."
+    )
+
+
+def test_delete_runs_constant_queries_per_batch(make_posts, user):
+    def measure(n):
+        make_posts(n)
+        with CaptureQueriesContext(connection) as queries:
+            deleted = delete_posts(Post.objects.filter(author=user))
+        assert deleted == n
+        return len(queries)
+
+    assert measure(2) == measure(60), (
+        "Убедитесь, что число запросов при массовом удалении не зависит от"
+        " числа публикаций и комментариев в пачке."
+    )
+    assert not Comment.objects.exists()
+
+
+def test_admin_actions(mixer, make_posts, user, another_user):
+    admin = mixer.blend("auth.User", is_staff=True, is_superuser=True)
+    client = Client()
+    client.force_login(admin)
+    mine = make_posts(2)
+    theirs = make_posts(2, author=another_user)
+    target = mixer.blend("blog.Category", is_published=True)
+
+    client.post("/admin/blog/post/", {
+        "action": "move_to_category",
+        "_selected_action": [post.id for post in mine],
+        "category": target.id,
+    })
+    assert set(target.posts.all()) == set(mine), (
+        "Убедитесь, что действие администратора переносит публикации."
+    )
+
+    client.post("/admin/blog/post/", {
+        "action": "delete_by_author",
+        "_selected_action": [mine[0].id],
+    })
+    assert Post.objects.filter(author=user).count() == 2, (
+        "Убедитесь, что удаление по автору требует подтверждения."
+    )
+    client.post("/admin/blog/post/", {
+        "action": "delete_by_author",
+        "_selected_action": [mine[0].id],
+        "confirm": "on",
+    })
+    assert set(Post.objects.all()) == set(theirs), (
+        "Убедитесь, что удаляются все публикации авторов выбранных"
+        " публикаций и только они."
+    )
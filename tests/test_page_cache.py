@@ -0,0 +1,71 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog.models import Comment, Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def page_urls(user, post_with_published_location):
+    post = post_with_published_location
+    return [
+        "/",
+        f"/posts/{post.id}/",
+        f"/category/{post.category.slug}/",
+        f"/profile/{user.username}/",
+    ]
+
+
+def test_anonymous_pages_served_from_cache(client, page_urls):
+    for url in page_urls:
+        content = client.get(url).content
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(url)
+        assert response.content == content
+        assert len(queries) <= 1, (
+            f"Убедитесь, что страница `{url}` отдаётся анонимным"
+            " пользователям из кеша."
+        )
+
+
+def test_page_cache_purged_by_signals(
+        client, user_client, post_with_published_location
+):
+    post = post_with_published_location
+    url = f"/posts/{post.id}/"
+    client.get(url)
+
+    Post.objects.filter(pk=post.pk).update(title="Правка без сигналов")
+    assert "Правка без сигналов" not in client.get(url).content.decode(), (
+        "Убедитесь, что страница для анонимных пользователей кешируется."
+    )
+    assert "Правка без сигналов" in user_client.get(url).content.decode(), (
+        "Убедитесь, что страницы авторизованных пользователей не кешируются."
+    )
+
+    post.refresh_from_db()
+    post.title = "Правка через модель"
+    post.save()
+    assert "Правка через модель" in client.get(url).content.decode(), (
+        "Убедитесь, что кеш страницы сбрасывается при изменении публикации."
+    )
+
+    post.location.name = "Новое место"
+    post.location.save()
+    assert "Новое место" in client.get(url).content.decode(), (
+        "Убедитесь, что кеш страницы сбрасывается при изменении"
+        " местоположения."
+    )
+
+    comment = Comment.objects.create(
+        post=post, author=post.author, text="Первый вариант"
+    )
+    assert "Первый вариант" in client.get(url).content.decode()
+    comment.text = "Исправленный вариант"
+    comment.save()
+    assert "Исправленный вариант" in client.get(url).content.decode(), (
+        "Убедитесь, что кеш страницы сбрасывается при редактировании"
+        " комментария."
+    )
@@ -0,0 +1,65 @@
+from datetime import timedelta
+
+import pytest
+from django.core.paginator import Paginator
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blog.views import KeysetPaginationMixin
+from conftest import N_PER_PAGE
+
+pytestmark = [pytest.mark.django_db]
+
+N_PAGES = 12
+
+
+@pytest.fixture
+def long_category_feed(mixer, user, published_category):
+    mixer.cycle(N_PER_PAGE * N_PAGES).blend(
+        "blog.Post",
+        author=user,
+        is_published=True,
+        category=published_category,
+        pub_date=(
+            timezone.now() - timedelta(hours=i)
+            for i in range(N_PER_PAGE * N_PAGES)
+        ),
+    )
+    return f"/category/{published_category.slug}/"
+
+
+def test_page_range_is_elided(user_client, long_category_feed):
+    response = user_client.get(f"{long_category_feed}?page=6")
+    page_range = response.context["page_range"]
+    assert Paginator.ELLIPSIS in page_range, (
+        "Убедитесь, что длинный список страниц сокращается многоточием."
+    )
+    assert 1 in page_range and N_PAGES in page_range and 6 in page_range, (
+        "Убедитесь, что в списке страниц остаются первая, последняя и"
+        " текущая страницы."
+    )
+    assert len(page_range) < N_PAGES, (
+        "Убедитесь, что в пагинаторе выводятся не все номера страниц."
+    )
+    assert '<span class="page-link">…</span>' in response.content.decode(
+        "utf-8"
+    ), "Убедитесь, что пропуск страниц отображается в пагинаторе."
+
+
+def test_approximate_count_is_cached(
+        monkeypatch, user_client, long_category_feed
+):
+    monkeypatch.setattr(KeysetPaginationMixin, "approximate_count", True)
+    user_client.get(long_category_feed)
+    with CaptureQueriesContext(connection) as queries:
+        response = user_client.get(f"{long_category_feed}?page=2")
+    assert response.context["paginator"].num_pages == N_PAGES, (
+        "Убедитесь, что приблизительный подсчёт даёт верное число страниц."
+    )
+    assert not any(
+        "COUNT(" in query["sql"].upper() for query in queries.captured_queries
+    ), (
+        "Убедитесь, что в режиме приблизительного подсчёта число публикаций"
+        " берётся из кэша, а не из `COUNT(*)` на каждый запрос."
+    )
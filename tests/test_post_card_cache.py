@@ -0,0 +1,32 @@
+import pytest
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_post_card_cache_invalidation(
+        mixer, user_client, post_with_published_location
+):
+    post = post_with_published_location
+    assert post.title in user_client.get("/").content.decode("utf-8")
+
+    post.title = "Заголовок после правки"
+    post.save()
+    content = user_client.get("/").content.decode("utf-8")
+    assert post.title in content, (
+        "Убедитесь, что карточка поста обновляется после его изменения."
+    )
+
+    post.category.title = "Категория после правки"
+    post.category.save()
+    content = user_client.get("/").content.decode("utf-8")
+    assert post.category.title in content, (
+        "Убедитесь, что карточка поста обновляется после изменения его"
+        " категории."
+    )
+
+    mixer.blend("blog.Comment", post=post)
+    content = user_client.get("/").content.decode("utf-8")
+    assert "Комментарии (1)" in content, (
+        "Убедитесь, что карточка поста обновляется после добавления"
+        " комментария."
+    )
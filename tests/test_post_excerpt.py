@@ -0,0 +1,66 @@
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+TEXT = " ".join(f"слово{i}" for i in range(30))
+EXCERPT = " ".join(f"слово{i}" for i in range(10)) + " …"
+
+
+def test_excerpt_saved_with_post(mixer, user, published_category):
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        pub_date=timezone.now(), text=TEXT
+    )
+    post.refresh_from_db()
+    assert post.excerpt == EXCERPT, (
+        "Убедитесь, что при сохранении поста сохраняется отрывок его текста."
+    )
+    post.text = "Новый текст"
+    post.save(update_fields=["text"])
+    post.refresh_from_db()
+    assert post.excerpt == "Новый текст", (
+        "Убедитесь, что отрывок обновляется вместе с текстом."
+    )
+
+
+def test_excerpt_not_refreshed_without_text(
+        mixer, user, published_category
+):
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        pub_date=timezone.now(), text=TEXT
+    )
+    post = Post.objects.defer("text").get(pk=post.pk)
+    post.title = "Новый заголовок"
+    post.save()
+    assert "text" in post.get_deferred_fields(), (
+        "Убедитесь, что сохранение поста без загруженного текста не"
+        " загружает текст ради отрывка."
+    )
+    post.refresh_from_db()
+    assert (post.title, post.excerpt) == ("Новый заголовок", EXCERPT), (
+        "Убедитесь, что сохранение поста без текста не меняет отрывок."
+    )
+
+
+def test_backfill_excerpts(client, mixer, user, published_category):
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, pub_date=timezone.now(), text=TEXT
+    )
+    client.get("/")
+    Post.objects.filter(pk=post.pk).update(excerpt="")
+
+    call_command("backfill_excerpts", batch_size=1)
+
+    post.refresh_from_db()
+    assert post.excerpt == EXCERPT, (
+        "Убедитесь, что команда `backfill_excerpts` заполняет отрывки."
+    )
+    assert EXCERPT in client.get("/").content.decode("utf-8"), (
+        "Убедитесь, что после заполнения отрывков карточки обновляются."
+    )
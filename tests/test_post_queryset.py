@@ -0,0 +1,50 @@
+import re
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_filters_chain(mixer, user, another_user, published_category):
+    mine = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, pub_date=timezone.now()
+    )
+    mixer.blend(
+        "blog.Post", author=another_user, category=published_category,
+        is_published=True, pub_date=timezone.now()
+    )
+    posts = Post.objects.published().for_category(
+        published_category
+    ).by_author(user)
+    assert list(posts) == [mine], (
+        "Убедитесь, что фильтры `PostQuerySet` можно сочетать."
+    )
+
+
+def test_feed_does_not_load_full_text(
+        client, mixer, user, published_category
+):
+    words = [f"слово{i}" for i in range(2000)]
+    mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, pub_date=timezone.now(), text=" ".join(words)
+    )
+    with CaptureQueriesContext(connection) as queries:
+        content = client.get("/").content.decode("utf-8")
+    feed_query = next(
+        query["sql"] for query in queries
+        if '"blog_post"."title"' in query["sql"]
+    )
+    assert not re.search(r'(?<!SUBSTR\()"blog_post"\."text"', feed_query), (
+        "Убедитесь, что лента не загружает полный текст публикаций."
+    )
+    assert " ".join(words[:10]) + " …" in content, (
+        "Убедитесь, что карточка поста показывает первые десять слов текста."
+    )
+    assert words[10] not in content
@@ -0,0 +1,52 @@
+from datetime import timedelta
+
+import pytest
+from django.contrib.auth.models import AnonymousUser
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_visible_to(mixer, user, another_user, published_category):
+    future = timezone.now() + timedelta(days=1)
+    visible = mixer.blend(
+        "blog.Post", author=another_user, category=published_category,
+        is_published=True, pub_date=timezone.now()
+    )
+    hidden = mixer.blend(
+        "blog.Post", author=another_user, category=published_category,
+        is_published=False, pub_date=timezone.now()
+    )
+    scheduled = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, pub_date=future
+    )
+    assert set(Post.objects.visible_to(AnonymousUser())) == {visible}, (
+        "Убедитесь, что анонимные пользователи видят только опубликованные"
+        " посты."
+    )
+    assert set(Post.objects.visible_to(user)) == {visible, scheduled}, (
+        "Убедитесь, что автор видит свои неопубликованные посты."
+    )
+    assert hidden not in Post.objects.visible_to(user)
+
+
+def test_detail_fetches_rendered_columns(
+        client, post_with_published_location
+):
+    post = post_with_published_location
+    with CaptureQueriesContext(connection) as queries:
+        client.get(f"/posts/{post.id}/")
+    post_query = next(
+        query["sql"] for query in queries
+        if '"blog_post"."title"' in query["sql"]
+    )
+    for column in ("created_at", "comment_count"):
+        assert f'"blog_post"."{column}"' not in post_query, (
+            "Убедитесь, что страница поста загружает только отображаемые"
+            " поля."
+        )
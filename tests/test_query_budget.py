@@ -0,0 +1,172 @@
+import json
+import os
+import time
+from datetime import timedelta
+from http import HTTPStatus
+from pathlib import Path
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import get_resolver, reverse
+from django.utils import timezone
+
+from blog.urls import urlpatterns
+from conftest import N_PER_PAGE
+
+REPORT_PATH = Path(
+    os.getenv(
+        "QUERY_BUDGET_REPORT",
+        Path(__file__).resolve().parent.parent / "query_budget_report.json",
+    )
+)
+
+# Queries a cold (uncached) request may run, including the session and user
+# lookups of a logged-in client.
+QUERY_BUDGETS = {
+    "blog:index": 6,
+    "blog:rss": 3,
+    "blog:atom": 3,
+    "blog:sitemap": 4,
+    "blog:sitemap_section": 1,
+    "blog:search": 4,
+    "blog:post_detail": 5,
+    "blog:category_posts": 6,
+    "blog:category_rss": 5,
+    "blog:category_atom": 5,
+    "blog:profile": 5,
+    "blog:profile_rss": 5,
+    "blog:profile_atom": 5,
+    "blog:edit_profile": 2,
+    "blog:create_post": 4,
+    "blog:edit_post": 5,
+    "blog:delete_post": 3,
+    "blog:add_comment": 2,
+    "blog:comments": 5,
+    "blog:edit_comment": 3,
+    "blog:delete_comment": 3,
+    "pages:about": 2,
+    "pages:rules": 2,
+}
+
+_report = {}
+
+
+@pytest.fixture(scope="module", autouse=True)
+def query_budget_report():
+    yield
+    if _report:
+        REPORT_PATH.write_text(
+            json.dumps(_report, ensure_ascii=False, indent=2, sort_keys=True)
+        )
+
+
+@pytest.fixture
+def feed(mixer, user, published_category, published_locations):
+    """Seed the feed, return a callable that adds more of the same."""
+    posts = []
+
+    def grow(n_posts, n_comments):
+        if not n_posts:
+            return posts
+        new_posts = mixer.cycle(n_posts).blend(
+            "blog.Post",
+            author=user,
+            is_published=True,
+            category=published_category,
+            location=mixer.sequence(*published_locations),
+            pub_date=(
+                timezone.now() - timedelta(hours=i) for i in range(n_posts)
+            ),
+        )
+        posts.extend(new_posts)
+        mixer.cycle(n_comments).blend(
+            "blog.Comment", post=posts[0], author=user
+        )
+        return posts
+
+    grow(N_PER_PAGE + 1, 3)
+    return grow
+
+
+def route_kwargs(route, post, comment, user, category):
+    return {
+        "blog:sitemap_section": {"section": "posts", "number": 0},
+        "blog:post_detail": {"post_id": post.id},
+        "blog:category_posts": {"category_slug": category.slug},
+        "blog:category_rss": {"category_slug": category.slug},
+        "blog:category_atom": {"category_slug": category.slug},
+        "blog:profile": {"username": user.username},
+        "blog:profile_rss": {"username": user.username},
+        "blog:profile_atom": {"username": user.username},
+        "blog:edit_post": {"post_id": post.id},
+        "blog:delete_post": {"post_id": post.id},
+        "blog:add_comment": {"post_id": post.id},
+        "blog:comments": {"post_id": post.id},
+        "blog:edit_comment": {"post_id": post.id, "comment_id": comment.id},
+        "blog:delete_comment": {
+            "post_id": post.id, "comment_id": comment.id
+        },
+    }.get(route, {})
+
+
+def route_query(route, post):
+    """Get the query string of routes that render nothing without one."""
+    if route == "blog:search":
+        return f"?q={post.title.split()[0]}"
+    return ""
+
+
+def measure(client, url):
+    cache.clear()
+    with CaptureQueriesContext(connection) as queries:
+        started = time.perf_counter()
+        response = client.get(url)
+        if response.streaming:
+            b"".join(response.streaming_content)
+        elapsed = time.perf_counter() - started
+    assert response.status_code == HTTPStatus.OK, (
+        f"Убедитесь, что страница `{url}` загружается без ошибок."
+    )
+    return len(queries), elapsed
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("route", sorted(QUERY_BUDGETS))
+def test_query_budget(route, feed, user, user_client, published_category):
+    post = feed(0, 0)[0]
+    comment = post.comments.first()
+    url = reverse(
+        route,
+        kwargs=route_kwargs(route, post, comment, user, published_category),
+    ) + route_query(route, post)
+
+    small_count, small_time = measure(user_client, url)
+    feed(N_PER_PAGE * 3, 50)
+    large_count, large_time = measure(user_client, url)
+    _report[route] = {
+        "url": url,
+        "queries": large_count,
+        "seconds": round(large_time, 5),
+    }
+
+    assert small_count == large_count, (
+        f"Убедитесь, что число запросов к базе данных на странице `{url}` не"
+        " зависит от числа публикаций и комментариев: было"
+        f" {small_count}, стало {large_count}."
+    )
+    assert large_count <= QUERY_BUDGETS[route], (
+        f"Страница `{url}` выполняет {large_count} запросов к базе данных"
+        f" при бюджете {QUERY_BUDGETS[route]}."
+    )
+
+
+def test_every_blog_route_has_budget():
+    routes = {
+        f"blog:{pattern.name}" for pattern in urlpatterns if pattern.name
+    }
+    assert routes <= set(QUERY_BUDGETS), (
+        "Убедитесь, что у каждого маршрута `blog.urls` есть бюджет"
+        f" запросов: нет бюджета для {sorted(routes - set(QUERY_BUDGETS))}."
+    )
@@ -0,0 +1,140 @@
+from http import HTTPStatus
+
+import pytest
+from django.conf import settings
+from django.http import HttpResponse
+from django.test import RequestFactory, override_settings
+
+from blog.models import Post
+from blogicum.db.routers import ReplicaRouter, replica_routing_middleware
+
+router = ReplicaRouter()
+
+pytestmark = [
+    pytest.mark.usefixtures("replicas"),
+]
+
+
+@pytest.fixture
+def replicas():
+    with override_settings(
+        DATABASE_REPLICAS=["replica_1"],
+        REPLICA_STICKY_COOKIE="use_primary",
+        REPLICA_STICKY_SECONDS=10,
+    ):
+        yield
+
+
+def route(request):
+    """Run a request through the middleware, return where reads went."""
+    used = []
+
+    def view(request):
+        used.append(router.db_for_read(Post))
+        return HttpResponse()
+
+    response = replica_routing_middleware(view)(request)
+    return used[0], response
+
+
+def test_safe_request_reads_from_replica():
+    database, response = route(RequestFactory().get("/"))
+    assert database == "replica_1", (
+        "Убедитесь, что GET-запросы читают данные с реплики."
+    )
+    assert "use_primary" not in response.cookies
+    assert router.db_for_read(Post) == "default", (
+        "Убедитесь, что вне запроса чтение идёт с основной базы."
+    )
+
+
+def test_write_sticks_client_to_primary():
+    database, response = route(RequestFactory().post("/"))
+    assert database == "default"
+    assert router.db_for_write(Post) == "default"
+    cookie = response.cookies["use_primary"]
+    assert cookie["max-age"] == 10, (
+        "Убедитесь, что после записи клиент получает cookie, закрепляющую"
+        " его чтения за основной базой."
+    )
+
+    request = RequestFactory().get("/")
+    request.COOKIES["use_primary"] = "1"
+    database, _ = route(request)
+    assert database == "default", (
+        "Убедитесь, что сразу после записи чтения клиента идут с основной"
+        " базы."
+    )
+
+
+def test_without_replicas_everything_uses_primary():
+    with override_settings(DATABASE_REPLICAS=[]):
+        database, response = route(RequestFactory().post("/"))
+        assert database == "default"
+        assert "use_primary" not in response.cookies
+        database, _ = route(RequestFactory().get("/"))
+        assert database == "default"
+
+
+@pytest.fixture
+def lagging_replica(monkeypatch):
+    """Route reads through the router, serving the replica's from primary."""
+    routed = []
+    db_for_read = ReplicaRouter.db_for_read
+
+    def record(self, model, **hints):
+        routed.append(db_for_read(self, model, **hints))
+        return "default"
+
+    monkeypatch.setattr(ReplicaRouter, "db_for_read", record)
+    with override_settings(
+        DATABASE_ROUTERS=["blogicum.db.routers.ReplicaRouter"],
+        MIDDLEWARE=[
+            "blogicum.db.routers.replica_routing_middleware",
+            *settings.MIDDLEWARE,
+        ],
+    ):
+        yield routed
+
+
+@pytest.mark.django_db
+def test_cache_fills_after_write_read_from_primary(
+        client, lagging_replica, post_with_published_location
+):
+    post = post_with_published_location
+    url = f"/posts/{post.id}/"
+    with override_settings(REPLICA_STICKY_SECONDS=0):
+        client.get(url)
+    assert set(lagging_replica) == {"replica_1"}, (
+        "Убедитесь, что страницы без свежих изменений читаются с реплики."
+    )
+
+    post.title = "Заголовок после записи"
+    post.save()
+    lagging_replica.clear()
+    response = client.get(url)
+    assert response.status_code == HTTPStatus.OK
+    assert "Заголовок после записи" in response.content.decode("utf-8")
+    assert lagging_replica[0] == "replica_1" and set(
+        lagging_replica[1:]
+    ) == {"default"}, (
+        "Убедитесь, что страница, кэшируемая под версией недавней записи,"
+        " читается с основной базы, а не с отстающей реплики."
+    )
+
+
+@pytest.mark.django_db
+def test_cards_read_from_lagging_replica_are_not_cached(
+        client, lagging_replica, post_with_published_location
+):
+    with override_settings(REPLICA_STICKY_SECONDS=0):
+        response = client.get("/")
+    assert response.context["card_cache_timeout"] > 0
+
+    post_with_published_location.location.name = "Новое место"
+    post_with_published_location.location.save()
+    response = client.get("/search/", {"q": "место"})
+    assert response.context["card_cache_timeout"] == 0, (
+        "Убедитесь, что карточки, прочитанные с реплики сразу после"
+        " записи, не попадают в кэш."
+    )
@@ -0,0 +1,134 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from blog.constants import Config
+
+pytestmark = [pytest.mark.django_db]
+
+
+def search(client, query, **params):
+    response = client.get("/search/", {"q": query, **params})
+    return list(response.context["page_obj"])
+
+
+@pytest.fixture
+def post_factory(mixer, user, published_category, published_location):
+    def make(**kwargs):
+        fields = {
+            "author": user,
+            "is_published": True,
+            "category": published_category,
+            "location": published_location,
+            "pub_date": timezone.now() - timedelta(hours=1),
+            **kwargs,
+        }
+        return mixer.blend("blog.Post", **fields)
+
+    return make
+
+
+def test_finds_posts_by_indexed_fields(client, post_factory):
+    by_title = post_factory(title="Прогулка по набережной")
+    by_text = post_factory(text="Видели маяк и чаек на закате")
+    post_factory(title="Другое", text="Ничего общего")
+    assert search(client, "набережной") == [by_title], (
+        "Убедитесь, что поиск находит публикации по заголовку."
+    )
+    assert search(client, "маяк чаек") == [by_text], (
+        "Убедитесь, что поиск находит публикации по тексту и требует"
+        " совпадения всех слов запроса."
+    )
+
+
+def test_respects_visibility(client, mixer, post_factory):
+    unpublished_category = mixer.blend("blog.Category", is_published=False)
+    post_factory(title="Секретный черновик", is_published=False)
+    post_factory(title="Секретный отложенный",
+                 pub_date=timezone.now() + timedelta(days=1))
+    post_factory(title="Секретный в скрытой категории",
+                 category=unpublished_category)
+    visible = post_factory(title="Секретный рецепт")
+    assert search(client, "секретный") == [visible], (
+        "Убедитесь, что поиск показывает только опубликованные публикации."
+    )
+
+
+def test_index_follows_changes(
+        client, post_factory, published_category, published_location
+):
+    post = post_factory(title="Старый заголовок")
+    post.title = "Свежий заголовок"
+    post.save()
+    assert search(client, "старый") == [], (
+        "Убедитесь, что индекс обновляется при изменении публикации."
+    )
+    assert search(client, "свежий") == [post]
+
+    published_category.title = "Путешествия"
+    published_category.save()
+    published_location.name = "Калининград"
+    published_location.save()
+    assert search(client, "путешествия калининград") == [post], (
+        "Убедитесь, что индекс обновляется при переименовании категории"
+        " и местоположения."
+    )
+
+    published_location.delete()
+    assert search(client, "калининград") == [], (
+        "Убедитесь, что индекс обновляется при удалении местоположения."
+    )
+    post.delete()
+    assert search(client, "свежий") == []
+
+
+def test_category_delete_reindexes_in_batches(
+        client, monkeypatch, mixer, post_factory
+):
+    monkeypatch.setattr(Config, "SEARCH_REINDEX_BATCH_SIZE", 2)
+    category = mixer.blend("blog.Category", is_published=True,
+                           title="Архитектура")
+    posts = [post_factory(category=category, title=f"Здание {i}")
+             for i in range(5)]
+    assert len(search(client, "архитектура")) == 5
+    category.delete()
+    assert search(client, "архитектура") == [], (
+        "Убедитесь, что при удалении категории переиндексируются все её"
+        " публикации."
+    )
+    for post in posts:
+        post.refresh_from_db()
+        assert post.category is None
+
+
+def test_query_syntax_is_not_interpreted(client, post_factory):
+    post = post_factory(title="Кофе и чай")
+    for query in ('"кофе', "кофе*", "(кофе)", "-кофе:"):
+        assert search(client, query) == [post], (
+            "Убедитесь, что операторы в поисковом запросе не приводят к"
+            " ошибкам."
+        )
+    assert search(client, "") == [], (
+        "Убедитесь, что пустой запрос ничего не находит."
+    )
+
+
+def test_pages_keep_query(client, post_factory):
+    for i in range(11):
+        post_factory(title=f"Заметка {i}")
+    response = client.get("/search/", {"q": "заметка"})
+    link = 'href="?q=%D0%B7%D0%B0%D0%BC%D0%B5%D1%82%D0%BA%D0%B0&amp;page=2"'
+    assert link in response.content.decode("utf-8"), (
+        "Убедитесь, что ссылки на страницы результатов сохраняют запрос."
+    )
+
+
+def test_rebuild_command(client, post_factory):
+    post = post_factory(title="Перестройка индекса")
+    call_command("rebuild_search_index")
+    assert search(client, "перестройка") == [post], (
+        "Убедитесь, что команда `rebuild_search_index` индексирует"
+        " публикации."
+    )
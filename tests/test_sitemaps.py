@@ -0,0 +1,126 @@
+import gzip
+import re
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blog.constants import Config
+
+pytestmark = [pytest.mark.django_db]
+
+
+def read(response):
+    return b"".join(response.streaming_content).decode("utf-8")
+
+
+@pytest.fixture
+def sitemap_posts(mixer, user, published_category):
+    now = timezone.now()
+    published = mixer.cycle(5).blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, pub_date=now - timedelta(days=1),
+    )
+    hidden = [
+        mixer.blend(
+            "blog.Post", author=user, category=published_category,
+            is_published=False, pub_date=now - timedelta(days=1),
+        ),
+        mixer.blend(
+            "blog.Post", author=user, category=published_category,
+            is_published=True, pub_date=now + timedelta(days=1),
+        ),
+    ]
+    return published, hidden
+
+
+def test_sitemap_lists_published_pages(
+        client, sitemap_posts, user, another_user, published_category,
+        monkeypatch
+):
+    monkeypatch.setattr(Config, "SITEMAP_CHUNK_SIZE", 2)
+    published, hidden = sitemap_posts
+    response = client.get("/sitemap.xml")
+    assert response.status_code == HTTPStatus.OK
+    assert response.streaming, (
+        "Убедитесь, что карта сайта отдаётся потоком."
+    )
+    chunks = re.findall(r"<loc>http://testserver(/[^<]+)</loc>", read(response))
+    assert len([c for c in chunks if "-posts-" in c]) > 1, (
+        "Убедитесь, что публикации разбиты на несколько файлов карты сайта."
+    )
+    content = "".join(read(client.get(chunk)) for chunk in chunks)
+    for post in published:
+        assert f"http://testserver/posts/{post.id}/</loc>" in content, (
+            "Убедитесь, что карта сайта содержит опубликованные посты."
+        )
+    for post in hidden:
+        assert f"/posts/{post.id}/</loc>" not in content, (
+            "Убедитесь, что карта сайта не содержит скрытые публикации."
+        )
+    assert f"/category/{published_category.slug}/</loc>" in content
+    assert f"/profile/{user.username}/</loc>" in content, (
+        "Убедитесь, что карта сайта содержит профили авторов."
+    )
+    assert f"/profile/{another_user.username}/</loc>" not in content, (
+        "Убедитесь, что в карте сайта нет профилей без публикаций."
+    )
+
+
+def test_profiles_without_slug_url_left_out(client, mixer, published_category):
+    names = ["jane.doe", "jane@doe", "jane+doe", "жанна", "jane-doe_2"]
+    for name in names:
+        mixer.blend(
+            "blog.Post", author=mixer.blend("auth.User", username=name),
+            category=published_category, is_published=True,
+            pub_date=timezone.now() - timedelta(days=1),
+        )
+    content = read(client.get("/sitemap-profiles-0.xml"))
+    locations = re.findall(r"<loc>http://testserver([^<]+)</loc>", content)
+    assert locations == ["/profile/jane-doe_2/"], (
+        "Убедитесь, что в карту сайта не попадают профили, у которых нет"
+        " адреса из-за символов имени пользователя."
+    )
+    for location in locations:
+        assert client.get(location).status_code == HTTPStatus.OK
+
+
+def test_index_bounds_cached(client, sitemap_posts):
+    expected = read(client.get("/sitemap.xml"))
+    with CaptureQueriesContext(connection) as queries:
+        content = read(client.get("/sitemap.xml"))
+    assert content == expected and not queries.captured_queries, (
+        "Убедитесь, что границы файлов карты сайта берутся из кэша."
+    )
+    sitemap_posts[0][0].save()
+    with CaptureQueriesContext(connection) as queries:
+        read(client.get("/sitemap.xml"))
+    assert queries.captured_queries, (
+        "Убедитесь, что кэш границ сбрасывается при изменении публикаций."
+    )
+
+
+def test_unknown_section_not_found(client):
+    assert client.get("/sitemap-nothing-0.xml").status_code == (
+        HTTPStatus.NOT_FOUND
+    )
+
+
+def test_generate_sitemaps_command(tmp_path, sitemap_posts):
+    call_command(
+        "generate_sitemaps", "https://blog.example.com",
+        output_dir=tmp_path
+    )
+    index = gzip.decompress((tmp_path / "sitemap.xml.gz").read_bytes())
+    locations = re.findall(
+        r"<loc>https://blog\.example\.com/([^<]+)</loc>", index.decode()
+    )
+    assert locations and all(
+        (tmp_path / location).exists() for location in locations
+    ), "Убедитесь, что команда создаёт все файлы из индекса карты сайта."
+    posts = gzip.decompress((tmp_path / locations[0]).read_bytes()).decode()
+    assert "https://blog.example.com/posts/" in posts
@@ -0,0 +1,95 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def feed_posts(mixer, user, another_user, published_category):
+    now = timezone.now()
+    return {
+        "mine": mixer.blend(
+            "blog.Post", author=user, category=published_category,
+            is_published=True, pub_date=now - timedelta(hours=1),
+            title="Моя публикация",
+        ),
+        "other": mixer.blend(
+            "blog.Post", author=another_user, category=published_category,
+            is_published=True, pub_date=now - timedelta(hours=2),
+            title="Чужая публикация",
+        ),
+        "draft": mixer.blend(
+            "blog.Post", author=user, category=published_category,
+            is_published=False, pub_date=now - timedelta(hours=3),
+            title="Черновик",
+        ),
+        "scheduled": mixer.blend(
+            "blog.Post", author=user, category=published_category,
+            is_published=True, pub_date=now + timedelta(days=1),
+            title="Отложенная публикация",
+        ),
+    }
+
+
+@pytest.mark.parametrize("feed_type", ["rss", "atom"])
+def test_feeds_list_published_posts(
+        client, feed_posts, user, published_category, feed_type
+):
+    urls = {
+        f"/{feed_type}/": ["Моя публикация", "Чужая публикация"],
+        f"/category/{published_category.slug}/{feed_type}/": [
+            "Моя публикация", "Чужая публикация"
+        ],
+        f"/profile/{user.username}/{feed_type}/": ["Моя публикация"],
+    }
+    for url, titles in urls.items():
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK, (
+            f"Убедитесь, что лента `{url}` доступна."
+        )
+        content = response.content.decode("utf-8")
+        for title in titles:
+            assert title in content, (
+                f"Убедитесь, что лента `{url}` содержит опубликованные посты."
+            )
+        for title in ("Черновик", "Отложенная публикация", "Чужая"):
+            if title not in " ".join(titles):
+                assert title not in content, (
+                    f"Убедитесь, что лента `{url}` показывает только"
+                    " опубликованные посты своего раздела."
+                )
+
+
+def test_unknown_feed_object_not_found(client, feed_posts):
+    assert client.get("/category/no-such-category/rss/").status_code == (
+        HTTPStatus.NOT_FOUND
+    ), "Убедитесь, что лента несуществующей категории возвращает 404."
+
+
+def test_polls_answered_from_cache(client, feed_posts):
+    response = client.get("/rss/")
+    etag = response["ETag"]
+    assert etag and response.has_header("Last-Modified"), (
+        "Убедитесь, что лента отдаётся с заголовками ETag и Last-Modified."
+    )
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get("/rss/", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+        "Убедитесь, что неизменившаяся лента отвечает 304 Not Modified."
+    )
+    assert not queries.captured_queries, (
+        "Убедитесь, что повторный опрос ленты не обращается к базе данных."
+    )
+
+    feed_posts["draft"].is_published = True
+    feed_posts["draft"].save()
+    response = client.get("/rss/", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK, (
+        "Убедитесь, что после изменения публикаций лента отдаётся заново."
+    )
+    assert "Черновик" in response.content.decode("utf-8")
@@ -0,0 +1,36 @@
+from django.conf import settings
+from django.template import engines
+from django.test import override_settings
+
+from blogicum.warmup import warm_up_templates
+
+CACHED_TEMPLATES = [{
+    **settings.TEMPLATES[0],
+    "APP_DIRS": False,
+    "OPTIONS": {
+        **settings.TEMPLATES[0]["OPTIONS"],
+        "loaders": [(
+            "django.template.loaders.cached.Loader", [
+                "django.template.loaders.filesystem.Loader",
+                "django.template.loaders.app_directories.Loader",
+            ]
+        )],
+    },
+}]
+
+
+def test_warm_up_fills_cached_loader():
+    with override_settings(TEMPLATES=CACHED_TEMPLATES):
+        assert warm_up_templates() > 0
+        cached_loader = engines["django"].engine.template_loaders[0]
+        for name in (
+                "blog/index.html",
+                "includes/post_card.html",
+                "includes/category_link.html",
+                "includes/paginator.html",
+                "includes/header.html",
+        ):
+            assert name in cached_loader.get_template_cache, (
+                f"Убедитесь, что шаблон `{name}` компилируется при запуске"
+                " процесса."
+            )
@@ -0,0 +1,115 @@
+from io import BytesIO
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from PIL import Image
+
+from blog.constants import Config
+from blog.images import thumbnail_name
+
+pytestmark = [pytest.mark.django_db]
+
+
+def make_image(width=1200, height=800):
+    buffer = BytesIO()
+    Image.new("RGB", (width, height), "red").save(buffer, "JPEG")
+    return SimpleUploadedFile(
+        "thumbnail_test.jpg", buffer.getvalue(), content_type="image/jpeg"
+    )
+
+
+def test_thumbnails_created_on_upload(user_client, post_with_published_location):
+    post = post_with_published_location
+    post.image = make_image()
+    post.save()
+
+    storage = post.image.storage
+    for width in Config.IMAGE_WIDTHS:
+        name = thumbnail_name(post.image.name, width)
+        assert storage.exists(name), (
+            f"Убедитесь, что при загрузке изображения создаётся его копия"
+            f" шириной {width} пикселей."
+        )
+        with storage.open(name) as thumbnail:
+            assert Image.open(thumbnail).width == width, (
+                "Убедитесь, что копии изображения уменьшены до нужной ширины."
+            )
+
+    content = user_client.get(f"/posts/{post.id}/").content.decode("utf-8")
+    assert f'srcset="{post.image_srcset}"' in content, (
+        "Убедитесь, что на странице поста у изображения есть атрибут `srcset`."
+    )
+
+
+def test_small_image_is_not_upscaled(post_with_published_location):
+    post = post_with_published_location
+    post.image = make_image(width=500, height=300)
+    post.save()
+    storage = post.image.storage
+    widths = [width for width in Config.IMAGE_WIDTHS if width <= 500]
+    for width in Config.IMAGE_WIDTHS:
+        assert storage.exists(thumbnail_name(post.image.name, width)) == (
+            width in widths
+        ), "Убедитесь, что копии шире исходного изображения не создаются."
+    expected = [
+        f"{storage.url(thumbnail_name(post.image.name, width))} {width}w"
+        for width in widths
+    ] + [f"{post.image.url} 500w"]
+    assert post.image_srcset == ", ".join(expected), (
+        "Убедитесь, что `srcset` перечисляет только существующие копии и"
+        " исходное изображение с его настоящей шириной."
+    )
+
+
+def test_unreadable_image_does_not_break_saving(post_with_published_location):
+    post = post_with_published_location
+    content = make_image().read()
+    post.image = SimpleUploadedFile(
+        "broken.jpg", content[:len(content) // 2], content_type="image/jpeg"
+    )
+    post.save()
+    post.refresh_from_db(fields=["image_width"])
+    assert post.image_width is None
+    assert not post.image.storage.exists(
+        thumbnail_name(post.image.name, max(Config.IMAGE_WIDTHS))
+    ), (
+        "Убедитесь, что публикация с нечитаемым изображением сохраняется,"
+        " а копии для него не создаются."
+    )
+
+
+def test_missing_image_file_does_not_break_pages(
+    client, post_with_published_location
+):
+    post = post_with_published_location
+    post._meta.model.objects.filter(pk=post.pk).update(
+        image="post_images/missing.jpg", image_width=None
+    )
+    for url in ("/", f"/posts/{post.id}/"):
+        assert client.get(url).status_code == 200, (
+            "Убедитесь, что страницы открываются, даже если файла изображения"
+            " публикации нет в хранилище."
+        )
+
+
+def test_generate_thumbnails_command(post_with_published_location):
+    post = post_with_published_location
+    post.image = make_image()
+    post.save()
+    storage = post.image.storage
+    for width in Config.IMAGE_WIDTHS:
+        storage.delete(thumbnail_name(post.image.name, width))
+    post._meta.model.objects.filter(pk=post.pk).update(image_width=None)
+
+    call_command("generate_thumbnails")
+
+    assert all(
+        storage.exists(thumbnail_name(post.image.name, width))
+        for width in Config.IMAGE_WIDTHS
+    ), "Убедитесь, что команда `generate_thumbnails` создаёт копии изображений."
+    post.refresh_from_db(fields=["image_width"])
+    assert post.image_width == 1200, (
+        "Убедитесь, что команда `generate_thumbnails` записывает ширину"
+        " изображений, загруженных раньше."
+    )